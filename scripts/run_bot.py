@@ -1,12 +1,12 @@
 """Script to run the trading bot directly (alternative to CLI)."""
 
-import asyncio
 import sys
 
 from pm_bot.api.client import KalshiClient
 from pm_bot.config import get_settings
 from pm_bot.data.store import DataStore
 from pm_bot.engine.bot import Bot
+from pm_bot.utils.aio import run
 from pm_bot.utils.logging import setup_logging
 
 
@@ -15,7 +15,7 @@ async def main() -> None:
     setup_logging(settings.log_level)
 
     client = KalshiClient(settings)
-    store = DataStore(settings.db_url)
+    store = DataStore(settings.db_url, settings.db_pragmas)
     await store.init_db()
 
     strategy_names = sys.argv[1:] or ["naive_value"]
@@ -32,4 +32,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -3,9 +3,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 import sys
 from pathlib import Path
+from typing import NamedTuple
 
 import httpx
 
@@ -13,6 +15,21 @@ KALSHI_BASE = "https://api.elections.kalshi.com/trade-api/v2"
 CITIES_JSON_URL = "https://gist.githubusercontent.com/Miserlou/c5cd8364bf9b2420bb29/raw/cities.json"
 PARSER_PATH = Path(__file__).resolve().parents[1] / "src" / "pm_bot" / "weather" / "parser.py"
 
+SERIES_TICKER_RE = re.compile(r"^KX(HIGH|LOW)([A-Z]{2,6})$")
+# Series prefix of a market ticker, e.g. KXHIGHNY-25JAN01-T45 -> ("HIGH", "NY")
+MARKET_TICKER_RE = re.compile(r"^KX(HIGH|LOW)([A-Z]{2,6})(?:-|$)")
+SERIES_TITLE_RE = re.compile(
+    r"(?:highest|lowest)\s+temperature\s+in\s+(.+?)(?:\s+(?:today|on|\,|\.)|$)", re.I
+)
+CITY_COORDS_ENTRY_RE = re.compile(
+    r'"([A-Z]{2,6})":\s*CityInfo\(([\d.-]+),\s*([\d.-]+),\s*"([^"]+)"\)'
+)
+CITY_COORDS_BLOCK_RE = re.compile(
+    r"(CITY_COORDS: dict\[str, CityInfo\] = \{\n)(.*?)(\n\})", re.DOTALL
+)
+QUOTE = '"'
+ESCAPED_QUOTE = '\\"'
+
 CODE_TO_NAME: dict[str, str] = {
     "NY": "New York", "NYC": "New York", "CHI": "Chicago", "LA": "Los Angeles",
     "MIA": "Miami", "DEN": "Denver", "HOU": "Houston", "PHX": "Phoenix",
@@ -33,42 +50,45 @@ CODE_TO_NAME: dict[str, str] = {
 }
 
 
-def fetch_kalshi_weather_series() -> list[dict]:
+async def _fetch_series_category(client: httpx.AsyncClient, category: str) -> list[dict]:
     all_series: list[dict] = []
     cursor = ""
-    for category in ("weather", "climate"):
-        while True:
-            params: dict[str, str] = {"category": category, "limit": "200"}
-            if cursor:
-                params["cursor"] = cursor
-            with httpx.Client(timeout=30) as client:
-                resp = client.get(f"{KALSHI_BASE}/series", params=params)
-                resp.raise_for_status()
-            data = resp.json()
-            series = data.get("series") or []
-            all_series.extend(series)
-            cursor = data.get("cursor", "")
-            if not cursor or not series:
-                break
+    while True:
+        params: dict[str, str] = {"category": category, "limit": "200"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get(f"{KALSHI_BASE}/series", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        series = data.get("series") or []
+        all_series.extend(series)
+        cursor = data.get("cursor", "")
+        if not cursor or not series:
+            break
     return all_series
 
 
+async def fetch_kalshi_weather_series(client: httpx.AsyncClient) -> list[dict]:
+    # Categories paginate independently, so walk them concurrently.
+    weather, climate = await asyncio.gather(
+        _fetch_series_category(client, "weather"),
+        _fetch_series_category(client, "climate"),
+    )
+    return weather + climate
+
+
 def extract_city_codes_from_series(series: list[dict]) -> dict[str, str | None]:
-    pattern = re.compile(r"^KX(HIGH|LOW)([A-Z]{2,6})$")
     result: dict[str, str | None] = {}
-    title_pattern = re.compile(
-        r"(?:highest|lowest)\s+temperature\s+in\s+(.+?)(?:\s+(?:today|on|\,|\.)|$)", re.I
-    )
     for s in series:
         ticker = s.get("ticker", "")
-        m = pattern.match(ticker)
+        m = SERIES_TICKER_RE.match(ticker)
         if not m:
             continue
         city_code = m.group(2)
         if city_code in result:
             continue
         title = s.get("title", "")
-        title_m = title_pattern.search(title)
+        title_m = SERIES_TITLE_RE.search(title)
         name = title_m.group(1).strip() if title_m else None
         if name:
             name = name.replace("NYC", "New York").replace("DC", "Washington")
@@ -76,10 +96,9 @@ def extract_city_codes_from_series(series: list[dict]) -> dict[str, str | None]:
     return result
 
 
-def fetch_major_cities(limit: int = 100) -> list[dict]:
-    with httpx.Client(timeout=30) as client:
-        resp = client.get(CITIES_JSON_URL)
-        resp.raise_for_status()
+async def fetch_major_cities(client: httpx.AsyncClient, limit: int = 100) -> list[dict]:
+    resp = await client.get(CITIES_JSON_URL)
+    resp.raise_for_status()
     data = resp.json()
     return sorted(
         (c for c in data if c.get("rank")),
@@ -87,95 +106,111 @@ def fetch_major_cities(limit: int = 100) -> list[dict]:
     )[:limit]
 
 
-def resolve_city(code: str, name_from_title: str | None, major_cities: list[dict]) -> tuple[float, float, str] | None:
+CityCoords = tuple[float, float, str]
+
+
+class CityIndex(NamedTuple):
+    """Lookup tables over the ranked city list, built once per sync."""
+
+    exact: dict[str, CityCoords]  # lowercased name -> coords (highest rank wins)
+    normalized: dict[str, CityCoords]  # same, with dots removed ("St. Louis" -> "st louis")
+    ranked: list[tuple[str, CityCoords]]  # (lowercased name, coords) in rank order
+
+
+def build_city_index(major_cities: list[dict]) -> CityIndex:
+    exact: dict[str, CityCoords] = {}
+    normalized: dict[str, CityCoords] = {}
+    ranked: list[tuple[str, CityCoords]] = []
+    for c in major_cities:
+        key = (c.get("city") or "").lower()
+        coords = (float(c["latitude"]), float(c["longitude"]), c["city"])
+        exact.setdefault(key, coords)
+        normalized.setdefault(key.replace(".", ""), coords)
+        ranked.append((key, coords))
+    return CityIndex(exact, normalized, ranked)
+
+
+def resolve_city(code: str, name_from_title: str | None, index: CityIndex) -> CityCoords | None:
     name = CODE_TO_NAME.get(code) or name_from_title
     if name:
         name_lower = name.lower()
-        for c in major_cities:
-            cn = (c.get("city") or "").lower()
-            if cn == name_lower or name_lower in cn or cn in name_lower:
-                return (float(c["latitude"]), float(c["longitude"]), c["city"])
-        if "washington" in name_lower:
-            for c in major_cities:
-                if (c.get("city") or "").lower() == "washington":
-                    return (float(c["latitude"]), float(c["longitude"]), "Washington DC")
-        name_norm = name.replace(".", "").lower()
-        for c in major_cities:
-            if (c.get("city") or "").replace(".", "").lower() == name_norm:
-                return (float(c["latitude"]), float(c["longitude"]), c["city"])
+        hit = index.exact.get(name_lower) or index.normalized.get(name_lower.replace(".", ""))
+        if hit:
+            return hit
+        for cn, coords in index.ranked:
+            if name_lower in cn or cn in name_lower:
+                return coords
+        if "washington" in name_lower and "washington" in index.exact:
+            lat, lon, _ = index.exact["washington"]
+            return (lat, lon, "Washington DC")
     code_lower = code.lower()
-    for c in major_cities:
-        cn = (c.get("city") or "").lower()
+    for cn, coords in index.ranked:
         if cn.startswith(code_lower) or code_lower in cn[:4]:
-            return (float(c["latitude"]), float(c["longitude"]), c["city"])
+            return coords
     return None
 
 
 def load_existing_coords() -> dict[str, tuple[float, float, str]]:
     content = PARSER_PATH.read_text()
     result: dict[str, tuple[float, float, str]] = {}
-    for m in re.compile(r'"([A-Z]{2,6})":\s*CityInfo\(([\d.-]+),\s*([\d.-]+),\s*"([^"]+)"\)').finditer(content):
+    for m in CITY_COORDS_ENTRY_RE.finditer(content):
         result[m.group(1)] = (float(m.group(2)), float(m.group(3)), m.group(4))
     return result
 
 
-def generate_parser_patch(merged: dict[str, tuple[float, float, str]]) -> str:
-    return "\n".join(
-        f'    "{code}": CityInfo({lat}, {lon}, "{name.replace(chr(34), chr(92)+chr(34))}"),'
-        for code in sorted(merged.keys())
-        for lat, lon, name in [merged[code]]
-    )
+def generate_parser_patch(merged: dict[str, CityCoords]) -> str:
+    lines: list[str] = []
+    append = lines.append
+    for code in sorted(merged):
+        lat, lon, name = merged[code]
+        append(f'    "{code}": CityInfo({lat}, {lon}, "{name.replace(QUOTE, ESCAPED_QUOTE)}"),')
+    return "\n".join(lines)
 
 
-def fetch_weather_cities_from_markets() -> dict[str, str | None]:
+async def fetch_weather_cities_from_markets(client: httpx.AsyncClient) -> dict[str, str | None]:
     """Fallback: fetch markets and extract city codes from KXHIGH*/KXLOW* tickers."""
-    pattern = re.compile(r"^KX(HIGH|LOW)([A-Z]{2,6})-\d{2}[A-Z]{3}\d{2}-T")
     result: dict[str, str | None] = {}
     cursor = ""
-    with httpx.Client(timeout=30) as client:
-        for _ in range(5):  # limit pages
-            params: dict[str, str] = {"limit": "200"}
-            if cursor:
-                params["cursor"] = cursor
-            resp = client.get(f"{KALSHI_BASE}/markets", params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            markets = data.get("markets") or []
-            for m in markets:
-                ticker = m.get("ticker", "")
-                if ticker.startswith(("KXHIGH", "KXLOW")):
-                    city_part = ticker.split("-")[0]
-                    m2 = re.match(r"^KX(HIGH|LOW)([A-Z]{2,6})$", city_part)
-                    if m2 and m2.group(2) not in result:
-                        result[m2.group(2)] = None
-            cursor = data.get("cursor") or ""
-            if not cursor or not markets:
-                break
+    for _ in range(5):  # limit pages
+        params: dict[str, str] = {"limit": "200"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get(f"{KALSHI_BASE}/markets", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        markets = data.get("markets") or []
+        for m in markets:
+            m2 = MARKET_TICKER_RE.match(m.get("ticker", ""))
+            if m2 and m2.group(2) not in result:
+                result[m2.group(2)] = None
+        cursor = data.get("cursor") or ""
+        if not cursor or not markets:
+            break
     return result
 
 
-def main() -> int:
-    print("Fetching major US cities...")
-    major_cities = fetch_major_cities(limit=150)
+async def sync_cities(client: httpx.AsyncClient) -> int:
+    print("Fetching major US cities and Kalshi weather series...")
+    major_cities, series = await asyncio.gather(
+        fetch_major_cities(client, limit=150),
+        fetch_kalshi_weather_series(client),
+    )
     print(f"  Loaded top {len(major_cities)} cities")
+    city_index = build_city_index(major_cities)
 
-    print("Fetching Kalshi weather series...")
-    series = fetch_kalshi_weather_series()
     city_codes = extract_city_codes_from_series(series)
     print(f"  Found {len(city_codes)} city codes from {len(series)} series")
 
     if not city_codes:
         print("  Trying markets endpoint as fallback...")
-        city_codes = fetch_weather_cities_from_markets()
+        city_codes = await fetch_weather_cities_from_markets(client)
         print(f"  Found {len(city_codes)} city codes from markets")
 
     if not city_codes:
         print("  Kalshi API returned no weather data. Seeding from CODE_TO_NAME + major cities...")
         for code, name in CODE_TO_NAME.items():
-            for c in major_cities:
-                if (c.get("city") or "").lower() == name.lower():
-                    city_codes[code] = name
-                    break
+            if name.lower() in city_index.exact:
+                city_codes[code] = name
 
     existing = load_existing_coords()
     merged = dict(existing)
@@ -184,7 +219,7 @@ def main() -> int:
     for code, name_from_title in city_codes.items():
         if code in merged:
             continue
-        resolved = resolve_city(code, name_from_title, major_cities)
+        resolved = resolve_city(code, name_from_title, city_index)
         if resolved:
             merged[code] = resolved
             added.append(f"  {code} -> {resolved[2]}")
@@ -202,15 +237,29 @@ def main() -> int:
 
     parser_content = PARSER_PATH.read_text()
     new_dict_body = generate_parser_patch(merged)
-    old_pat = re.compile(r"(CITY_COORDS: dict\[str, CityInfo\] = \{\n)(.*?)(\n\})", re.DOTALL)
-    if not old_pat.search(parser_content):
+    if not CITY_COORDS_BLOCK_RE.search(parser_content):
         print("ERROR: Could not find CITY_COORDS block in parser.py")
         return 1
 
-    PARSER_PATH.write_text(old_pat.sub(rf"\g<1>{new_dict_body}\n\3", parser_content))
+    PARSER_PATH.write_text(CITY_COORDS_BLOCK_RE.sub(rf"\g<1>{new_dict_body}\n\3", parser_content))
     print(f"\nUpdated {PARSER_PATH} with {len(merged)} cities")
     return 0
 
 
+async def _main() -> int:
+    # One pooled client for every request: keep-alive avoids a TLS handshake per page,
+    # and HTTP/2 multiplexes the concurrent fetches over a single connection.
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(keepalive_expiry=60),
+    ) as client:
+        return await sync_cities(client)
+
+
+def main() -> int:
+    return asyncio.run(_main())
+
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -12,11 +12,11 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import uuid
 
 from pm_bot.api.client import KalshiClient
-from pm_bot.api.models import Action, OrderRequest, OrderType, Side
+from pm_bot.api.models import Action, OrderBookResponse, OrderRequest, OrderType, Side
 from pm_bot.config import get_settings
+from pm_bot.utils.aio import run
 
 
 async def _run(ticker: str | None = None) -> None:
@@ -42,13 +42,23 @@ async def _run(ticker: str | None = None) -> None:
                 print("No markets found. Try specifying --ticker.")
                 return
 
-        # Try to get orderbook and place order
+        # Fetch orderbooks for up to 10 markets concurrently, then place on the first usable one
+        candidates = markets[:10]
+        sem = asyncio.Semaphore(8)
+
+        async def fetch_orderbook(t: str) -> OrderBookResponse:
+            async with sem:
+                return await client.get_orderbook(t)
+
+        ob_results = await asyncio.gather(
+            *(fetch_orderbook(m.ticker) for m in candidates),
+            return_exceptions=True,
+        )
+
         last_error = None
-        for market in markets[:10]:  # Try up to 10 markets
-            try:
-                ob_resp = await client.get_orderbook(market.ticker)
-            except Exception as e:
-                last_error = e
+        for market, ob_resp in zip(candidates, ob_results):
+            if isinstance(ob_resp, Exception):
+                last_error = ob_resp
                 continue
 
             ob = ob_resp.orderbook
@@ -76,7 +86,6 @@ async def _run(ticker: str | None = None) -> None:
                 type=OrderType.LIMIT,
                 yes_price=price,
                 no_price=None,
-                client_order_id=str(uuid.uuid4()),
             )
 
             resp = await client.create_order(req)
@@ -84,7 +93,7 @@ async def _run(ticker: str | None = None) -> None:
 
             print("\nOrder placed successfully!")
             print(f"  Order ID: {order.order_id}")
-            print(f"  Status: {order.status.value}")
+            print(f"  Status: {order.status}")
             print(f"  Check your orders at demo.kalshi.co")
             return
 
@@ -103,7 +112,7 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Place a ~$1 test buy order")
     parser.add_argument("--ticker", type=str, help="Market ticker (e.g. KXQUICKSETTLE-26FEB19)")
     args = parser.parse_args()
-    asyncio.run(_run(ticker=args.ticker))
+    run(_run(ticker=args.ticker))
 
 
 if __name__ == "__main__":
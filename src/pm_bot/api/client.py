@@ -4,12 +4,16 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
 import time
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
 
 import httpx
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
+import orjson
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from pydantic import TypeAdapter
 
 from pm_bot.api.models import (
     Balance,
@@ -31,30 +35,66 @@ log = get_logger("api.client")
 MAX_RETRIES = 3
 RATE_LIMIT_SLEEP = 1.0
 
+_METHOD_BYTES = {"GET": b"GET", "POST": b"POST", "DELETE": b"DELETE"}
+_SIGN_PREFIX = b"/trade-api/v2"
+# A GET signature (and its timestamp) is reused for this long, well inside the
+# server's timestamp tolerance, so repeated polls skip the RSA operation.
+SIGNATURE_REUSE_MS = 500
+_SIGNATURE_CACHE_SIZE = 256
+# Market list pages kept for conditional re-fetches; a full scan is a few dozen pages.
+_MARKETS_PAGE_CACHE_SIZE = 128
 
-class RateLimiter:
-    """Token-bucket rate limiter for API requests."""
+# Bulk fetches (orderbook batches in the engine, scan) are multiplexed over a few
+# HTTP/2 connections; keep them warm between polls instead of re-handshaking TLS.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
 
-    def __init__(self, requests_per_second: float = 10.0) -> None:
-        self._rate = requests_per_second
-        self._tokens = requests_per_second
-        self._max_tokens = requests_per_second
-        self._last_refill = time.monotonic()
-        self._lock = asyncio.Lock()
+# Validators are built once at import and reused for every response.
+_MARKETS_ADAPTER = TypeAdapter(MarketsResponse)
+_MARKET_ADAPTER = TypeAdapter(Market)
+_EVENTS_ADAPTER = TypeAdapter(EventsResponse)
+_ORDERBOOK_ADAPTER = TypeAdapter(OrderBookResponse)
+_ORDER_ADAPTER = TypeAdapter(OrderResponse)
+_ORDERS_ADAPTER = TypeAdapter(OrdersResponse)
+_POSITIONS_ADAPTER = TypeAdapter(PositionsResponse)
+_BALANCE_ADAPTER = TypeAdapter(Balance)
+_FILLS_ADAPTER = TypeAdapter(FillsResponse)
+
+
+class _CachedPage(NamedTuple):
+    etag: str
+    body_digest: bytes
+    response: MarketsResponse
 
-    async def acquire(self) -> None:
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last_refill
-            self._tokens = min(self._max_tokens, self._tokens + elapsed * self._rate)
-            self._last_refill = now
 
-            if self._tokens < 1:
-                wait = (1 - self._tokens) / self._rate
-                await asyncio.sleep(wait)
-                self._tokens = 0
-            else:
-                self._tokens -= 1
+def _body_digest(body: bytes) -> bytes:
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+class RateLimiter:
+    """Token-bucket rate limiter for API requests.
+
+    Tracked as a single theoretical-arrival time (GCRA) rather than a token count, so
+    ``acquire`` needs no lock: the event loop is single-threaded and the bookkeeping
+    happens before the only ``await``.
+    """
+
+    def __init__(self, requests_per_second: float = 10.0, burst: float | None = None) -> None:
+        """``burst`` requests may go out at once from idle; defaults to one second's worth."""
+        self._interval = 1.0 / requests_per_second
+        if burst is None:
+            burst = requests_per_second
+        # How far ahead of the steady rate the arrival time may run before callers wait.
+        self._tolerance = burst * self._interval
+        self._next_available = time.monotonic()
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        next_available = max(self._next_available, now) + self._interval
+        self._next_available = next_available
+        wait = next_available - self._tolerance - now
+        if wait > 0:
+            await asyncio.sleep(wait)
 
 
 class KalshiClient:
@@ -64,44 +104,73 @@ class KalshiClient:
         self._settings = settings
         self._base_url = settings.base_url
         self._api_key_id = settings.kalshi_api_key_id
-        self._private_key = self._load_private_key(settings)
+        self._private_key = settings.private_key
+        # Signing parameters are constant; build them once instead of per request.
+        self._pss = padding.PSS(
+            mgf=padding.MGF1(hashes.SHA256()),
+            salt_length=padding.PSS.DIGEST_LENGTH,
+        )
+        self._hash = hashes.SHA256()
+        self._signature_cache: dict[str, tuple[int, str]] = {}
+        # Last response per get_markets query, for conditional re-fetches. Kept in
+        # least recently used order.
+        self._markets_pages: dict[tuple[int, str, str, str], _CachedPage] = {}
         self._http = httpx.AsyncClient(
             base_url=self._base_url,
-            timeout=30.0,
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS,
             http2=True,
         )
         self._rate_limiter = RateLimiter(requests_per_second=8.0)
-
-    @staticmethod
-    def _load_private_key(settings: Settings) -> rsa.RSAPrivateKey:
-        pem_data = settings.private_key_pem.encode()
-        return serialization.load_pem_private_key(pem_data, password=None)
-
-    def _sign(self, timestamp_ms: str, method: str, path: str) -> str:
-        """Sign request per Kalshi docs: timestamp + method + path (no query params)."""
-        message = f"{timestamp_ms}{method}{path}".encode()
-        signature = self._private_key.sign(
-            message,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.DIGEST_LENGTH,
+        self._dispatch: dict[str, Callable[..., Awaitable[httpx.Response]]] = {
+            "GET": lambda path, headers, params, data: self._http.get(
+                path, headers=headers, params=params
+            ),
+            "POST": lambda path, headers, params, data: self._http.post(
+                path, headers=headers, content=orjson.dumps(data or {})
             ),
-            hashes.SHA256(),
+            "DELETE": lambda path, headers, params, data: self._http.delete(
+                path, headers=headers
+            ),
+        }
+
+    def _sign(self, timestamp_ms: int, method: str, path: str) -> str:
+        """Sign request per Kalshi docs: timestamp + method + path (no query params).
+
+        ``path`` is relative to the API root; the /trade-api/v2 prefix is added here.
+        """
+        message = b"".join(
+            (b"%d" % timestamp_ms, _METHOD_BYTES[method], _SIGN_PREFIX, path.encode("ascii"))
         )
+        signature = self._private_key.sign(message, self._pss, self._hash)
         return base64.b64encode(signature).decode()
 
     def _auth_headers(self, method: str, path: str) -> dict[str, str]:
         """Path for signing must include /trade-api/v2 prefix (Kalshi requirement)."""
-        timestamp_ms = str(int(time.time() * 1000))
-        sign_path = f"/trade-api/v2{path}"
-        signature = self._sign(timestamp_ms, method, sign_path)
+        now_ms = time.time_ns() // 1_000_000
+        if method == "GET":
+            timestamp_ms, signature = self._cached_get_signature(now_ms, path)
+        else:
+            timestamp_ms, signature = now_ms, self._sign(now_ms, method, path)
         return {
             "KALSHI-ACCESS-KEY": self._api_key_id,
-            "KALSHI-ACCESS-TIMESTAMP": timestamp_ms,
+            "KALSHI-ACCESS-TIMESTAMP": str(timestamp_ms),
             "KALSHI-ACCESS-SIGNATURE": signature,
             "Content-Type": "application/json",
         }
 
+    def _cached_get_signature(self, now_ms: int, path: str) -> tuple[int, str]:
+        """Kalshi keys are RSA-only, so memoize GET signatures instead of re-signing."""
+        cached = self._signature_cache.get(path)
+        if cached is not None and now_ms - cached[0] < SIGNATURE_REUSE_MS:
+            return cached
+        if len(self._signature_cache) >= _SIGNATURE_CACHE_SIZE:
+            # Entries go stale within SIGNATURE_REUSE_MS, so dropping them all is cheap.
+            self._signature_cache.clear()
+        entry = (now_ms, self._sign(now_ms, "GET", path))
+        self._signature_cache[path] = entry
+        return entry
+
     async def _request_with_retry(
         self,
         method: str,
@@ -110,18 +179,31 @@ class KalshiClient:
         params: dict[str, Any] | None = None,
         json_data: dict[str, Any] | None = None,
     ) -> dict:
+        resp = await self._send_with_retry(method, path, params=params, json_data=json_data)
+        return orjson.loads(resp.content)
+
+    async def _send_with_retry(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        extra_headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Send with rate limiting and retries; any non-2xx status except 304 raises."""
+        send = self._dispatch.get(method)
+        if send is None:
+            raise ValueError(f"Unsupported method: {method}")
+
         for attempt in range(MAX_RETRIES):
             await self._rate_limiter.acquire()
+            # Signed per attempt: a 429 back-off can outlast the GET signature window.
             headers = self._auth_headers(method, path)
+            if extra_headers:
+                headers.update(extra_headers)
             try:
-                if method == "GET":
-                    resp = await self._http.get(path, headers=headers, params=params)
-                elif method == "POST":
-                    resp = await self._http.post(path, headers=headers, json=json_data or {})
-                elif method == "DELETE":
-                    resp = await self._http.delete(path, headers=headers)
-                else:
-                    raise ValueError(f"Unsupported method: {method}")
+                resp = await send(path, headers, params, json_data)
 
                 if resp.status_code == 429:
                     retry_after = float(resp.headers.get("Retry-After", RATE_LIMIT_SLEEP))
@@ -129,8 +211,9 @@ class KalshiClient:
                     await asyncio.sleep(retry_after)
                     continue
 
-                resp.raise_for_status()
-                return resp.json()
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+                return resp
 
             except httpx.HTTPStatusError:
                 raise
@@ -166,17 +249,39 @@ class KalshiClient:
         status: str = "open",
         event_ticker: str = "",
     ) -> MarketsResponse:
+        """One page of markets.
+
+        Pages are fetched conditionally: a page whose ETag or body matches the last
+        response for the same query returns that parsed response again, skipping
+        the JSON decode and validation. Treat the result as read-only.
+        """
         params: dict[str, Any] = {"limit": limit, "status": status}
         if cursor:
             params["cursor"] = cursor
         if event_ticker:
             params["event_ticker"] = event_ticker
-        data = await self._get("/markets", params=params)
-        return MarketsResponse.model_validate(data)
+
+        key = (limit, cursor, status, event_ticker)
+        # Popped and re-inserted below, which moves the entry to the most recent end.
+        cached = self._markets_pages.pop(key, None)
+        extra_headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+        resp = await self._send_with_retry(
+            "GET", "/markets", params=params, extra_headers=extra_headers
+        )
+        digest = _body_digest(resp.content) if resp.status_code != 304 else b""
+        if cached is not None and (resp.status_code == 304 or digest == cached.body_digest):
+            self._markets_pages[key] = cached
+            return cached.response
+
+        markets = _MARKETS_ADAPTER.validate_python(orjson.loads(resp.content))
+        if len(self._markets_pages) >= _MARKETS_PAGE_CACHE_SIZE:
+            del self._markets_pages[next(iter(self._markets_pages))]
+        self._markets_pages[key] = _CachedPage(resp.headers.get("ETag", ""), digest, markets)
+        return markets
 
     async def get_market(self, ticker: str) -> Market:
         data = await self._get(f"/markets/{ticker}")
-        return Market.model_validate(data.get("market", data))
+        return _MARKET_ADAPTER.validate_python(data.get("market", data))
 
     async def get_events(
         self,
@@ -189,28 +294,28 @@ class KalshiClient:
         if cursor:
             params["cursor"] = cursor
         data = await self._get("/events", params=params)
-        return EventsResponse.model_validate(data)
+        return _EVENTS_ADAPTER.validate_python(data)
 
     async def get_orderbook(self, ticker: str, depth: int = 10) -> OrderBookResponse:
         data = await self._get(f"/markets/{ticker}/orderbook", params={"depth": depth})
-        # Normalize [price, quantity] arrays to {price, quantity} objects.
-        # Kalshi returns ascending order; we want best (highest) bid first.
+        # Kalshi returns [price, quantity] pairs in ascending order; we want best
+        # (highest) bid first. The pairs validate directly into OrderBookLevel tuples.
         ob = data.get("orderbook", data)
         if ob:
             for key in ("yes", "no"):
-                raw = ob.get(key, [])
-                levels = [{"price": p, "quantity": q} for p, q in raw] if raw else []
-                ob[key] = list(reversed(levels))  # best bid first
-        return OrderBookResponse.model_validate(data)
+                raw = ob.get(key) or []
+                raw.reverse()  # best bid first; the freshly decoded list is ours to mutate
+                ob[key] = raw
+        return _ORDERBOOK_ADAPTER.validate_python(data)
 
     # --- Orders ---
 
     async def create_order(self, order: OrderRequest) -> OrderResponse:
         data = await self._post(
             "/portfolio/orders",
-            data=order.model_dump(exclude_none=True),
+            data=order.model_dump(mode="json", exclude_none=True),
         )
-        return OrderResponse.model_validate(data)
+        return _ORDER_ADAPTER.validate_python(data)
 
     async def cancel_order(self, order_id: str) -> dict:
         return await self._delete(f"/portfolio/orders/{order_id}")
@@ -231,7 +336,7 @@ class KalshiClient:
         if cursor:
             params["cursor"] = cursor
         data = await self._get("/portfolio/orders", params=params)
-        return OrdersResponse.model_validate(data)
+        return _ORDERS_ADAPTER.validate_python(data)
 
     # --- Portfolio ---
 
@@ -245,23 +350,26 @@ class KalshiClient:
         if cursor:
             params["cursor"] = cursor
         data = await self._get("/portfolio/positions", params=params)
-        return PositionsResponse.model_validate(data)
+        return _POSITIONS_ADAPTER.validate_python(data)
 
     async def get_balance(self) -> Balance:
         data = await self._get("/portfolio/balance")
-        return Balance.model_validate(data)
+        return _BALANCE_ADAPTER.validate_python(data)
 
     async def get_fills(
         self,
         *,
         ticker: str = "",
+        order_id: str = "",
         limit: int = 100,
         cursor: str = "",
     ) -> FillsResponse:
         params: dict[str, Any] = {"limit": limit}
         if ticker:
             params["ticker"] = ticker
+        if order_id:
+            params["order_id"] = order_id
         if cursor:
             params["cursor"] = cursor
         data = await self._get("/portfolio/fills", params=params)
-        return FillsResponse.model_validate(data)
+        return _FILLS_ADAPTER.validate_python(data)
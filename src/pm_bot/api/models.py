@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import Literal, NamedTuple
+from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
@@ -47,13 +49,26 @@ class Action(str, Enum):
     SELL = "sell"
 
 
+# Response models type these fields as Literals: pydantic checks them with a set
+# lookup instead of constructing enum members. The enums above remain the named
+# constants (``Action.BUY == "buy"``).
+MarketStatusValue = Literal[
+    "initialized", "inactive", "active", "closed", "determined",
+    "disputed", "amended", "finalized", "open", "settled",
+]
+OrderTypeValue = Literal["limit", "market"]
+OrderStatusValue = Literal["resting", "canceled", "executed", "pending"]
+SideValue = Literal["yes", "no"]
+ActionValue = Literal["buy", "sell"]
+
+
 # --- Market models ---
 
 class Market(BaseModel):
     ticker: str
     title: str
     subtitle: str = ""
-    status: MarketStatus = MarketStatus.OPEN
+    status: MarketStatusValue = "open"
     yes_bid: int = 0
     yes_ask: int = 0
     no_bid: int = 0
@@ -67,8 +82,6 @@ class Market(BaseModel):
     expiration_time: datetime | None = None
     result: str = ""
 
-    model_config = {"extra": "allow"}
-
 
 class MarketsResponse(BaseModel):
     markets: list[Market] = []
@@ -81,8 +94,6 @@ class Event(BaseModel):
     category: str = ""
     markets: list[Market] = []
 
-    model_config = {"extra": "allow"}
-
 
 class EventsResponse(BaseModel):
     events: list[Event] = []
@@ -91,9 +102,10 @@ class EventsResponse(BaseModel):
 
 # --- Orderbook models ---
 
-class OrderBookLevel(BaseModel):
+class OrderBookLevel(NamedTuple):
+    """One price level; validates straight from Kalshi's ``[price, quantity]`` pairs."""
     price: int
-    quantity: int = Field(alias="quantity", default=0)
+    quantity: int = 0
 
 
 class OrderBook(BaseModel):
@@ -109,21 +121,31 @@ class OrderBook(BaseModel):
         return (100 - self.no[0].price) if self.no else None
 
     @property
-    def mid_price(self) -> float | None:
+    def mid_price_x2(self) -> int | None:
+        """Twice the mid price, in integer cents; halve only for display."""
         bid = self.best_yes_bid
         ask = self.best_yes_ask
         if bid is not None and ask is not None:
-            return (bid + ask) / 2.0
+            return bid + ask
         return None
 
     @property
-    def spread(self) -> int | None:
+    def mid_price(self) -> float | None:
+        mid_x2 = self.mid_price_x2
+        return mid_x2 / 2.0 if mid_x2 is not None else None
+
+    @property
+    def spread_ticks(self) -> int | None:
         bid = self.best_yes_bid
         ask = self.best_yes_ask
         if bid is not None and ask is not None:
             return ask - bid
         return None
 
+    @property
+    def spread(self) -> int | None:
+        return self.spread_ticks
+
 
 class OrderBookResponse(BaseModel):
     orderbook: OrderBook
@@ -139,7 +161,8 @@ class OrderRequest(BaseModel):
     type: OrderType
     yes_price: int | None = None
     no_price: int | None = None
-    client_order_id: str
+    # Kept as a UUID; formatted to its hex string only when the request is serialized.
+    client_order_id: UUID = Field(default_factory=uuid4)
 
     model_config = {"extra": "allow"}
 
@@ -147,10 +170,10 @@ class OrderRequest(BaseModel):
 class Order(BaseModel):
     order_id: str = ""
     ticker: str = ""
-    action: Action = Action.BUY
-    side: Side = Side.YES
-    type: OrderType = OrderType.LIMIT
-    status: OrderStatus = OrderStatus.PENDING
+    action: ActionValue = "buy"
+    side: SideValue = "yes"
+    type: OrderTypeValue = "limit"
+    status: OrderStatusValue = "pending"
     yes_price: int = 0
     no_price: int = 0
     remaining_count: int = 0
@@ -158,8 +181,6 @@ class Order(BaseModel):
     created_time: datetime | None = None
     client_order_id: str = ""
 
-    model_config = {"extra": "allow"}
-
 
 class OrderResponse(BaseModel):
     order: Order
@@ -180,8 +201,6 @@ class Position(BaseModel):
     quantity: int = 0
     side: str = ""
 
-    model_config = {"extra": "allow"}
-
     @property
     def position_cost_dollars(self) -> float:
         return self.position_cost / 10_000
@@ -206,15 +225,13 @@ class Fill(BaseModel):
     trade_id: str = ""
     order_id: str = ""
     ticker: str = ""
-    action: Action = Action.BUY
-    side: Side = Side.YES
+    action: ActionValue = "buy"
+    side: SideValue = "yes"
     count: int = 0
     yes_price: int = 0
     no_price: int = 0
     created_time: datetime | None = None
 
-    model_config = {"extra": "allow"}
-
 
 class FillsResponse(BaseModel):
     fills: list[Fill] = []
@@ -226,8 +243,6 @@ class FillsResponse(BaseModel):
 class Balance(BaseModel):
     balance: int = 0
 
-    model_config = {"extra": "allow"}
-
     @property
     def balance_dollars(self) -> float:
         return self.balance / 100
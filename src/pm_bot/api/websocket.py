@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
 import time
 from typing import Any, Callable, Coroutine
 
+import orjson
 import websockets
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
 
 from pm_bot.config import Settings
 from pm_bot.utils.logging import get_logger
@@ -19,49 +19,50 @@ log = get_logger("api.websocket")
 
 Callback = Callable[[dict[str, Any]], Coroutine[Any, Any, None]]
 
+WS_PATH = "/trade-api/ws/v2"
+# Reconnects within this window reuse the previous handshake signature instead of
+# paying for another RSA operation; it covers the 5s reconnect back-off.
+SIGNATURE_REUSE_MS = 10_000
+
 
 class KalshiWebSocket:
     """Manages a persistent WebSocket connection to Kalshi for streaming data."""
 
+    _PSS = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+    _HASH = hashes.SHA256()
+
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._ws_url = settings.ws_url
         self._api_key_id = settings.kalshi_api_key_id
-        self._private_key = self._load_private_key(settings)
+        self._private_key = settings.private_key
         self._ws: websockets.WebSocketClientProtocol | None = None
         self._callbacks: dict[str, list[Callback]] = {}
+        # Frozen view of _callbacks read on every message; rebuilt by on().
+        self._dispatch: dict[str, tuple[Callback, ...]] = {}
         self._running = False
         self._cmd_id = 0
-
-    @staticmethod
-    def _load_private_key(settings: Settings) -> rsa.RSAPrivateKey:
-        pem_data = settings.private_key_pem.encode()
-        return serialization.load_pem_private_key(pem_data, password=None)
+        self._last_auth: tuple[int, str] | None = None
 
     def _sign(self, timestamp_ms: str, method: str, path: str) -> str:
         message = f"{timestamp_ms}{method}{path}".encode()
-        signature = self._private_key.sign(
-            message,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH,
-            ),
-            hashes.SHA256(),
-        )
+        signature = self._private_key.sign(message, self._PSS, self._HASH)
         return base64.b64encode(signature).decode()
 
     def _auth_headers(self) -> dict[str, str]:
-        timestamp_ms = str(int(time.time() * 1000))
-        path = "/trade-api/ws/v2"
-        signature = self._sign(timestamp_ms, "GET", path)
+        now_ms = time.time_ns() // 1_000_000
+        if self._last_auth is None or now_ms - self._last_auth[0] >= SIGNATURE_REUSE_MS:
+            self._last_auth = (now_ms, self._sign(str(now_ms), "GET", WS_PATH))
+        timestamp_ms, signature = self._last_auth
         return {
             "KALSHI-ACCESS-KEY": self._api_key_id,
-            "KALSHI-ACCESS-TIMESTAMP": timestamp_ms,
+            "KALSHI-ACCESS-TIMESTAMP": str(timestamp_ms),
             "KALSHI-ACCESS-SIGNATURE": signature,
         }
 
     def on(self, channel: str, callback: Callback) -> None:
         self._callbacks.setdefault(channel, []).append(callback)
+        self._dispatch = {ch: tuple(cbs) for ch, cbs in self._callbacks.items()}
 
     def _next_cmd_id(self) -> int:
         self._cmd_id += 1
@@ -77,7 +78,7 @@ class KalshiWebSocket:
         }
         if market_tickers:
             msg["params"]["market_tickers"] = market_tickers
-        await self._ws.send(json.dumps(msg))
+        await self._ws.send(orjson.dumps(msg).decode())
         log.info("subscribed", channels=channels, tickers=market_tickers)
 
     async def unsubscribe(self, channels: list[str], market_tickers: list[str] | None = None) -> None:
@@ -90,11 +91,17 @@ class KalshiWebSocket:
         }
         if market_tickers:
             msg["params"]["market_tickers"] = market_tickers
-        await self._ws.send(json.dumps(msg))
+        await self._ws.send(orjson.dumps(msg).decode())
 
     async def connect(self) -> None:
         headers = self._auth_headers()
-        self._ws = await websockets.connect(self._ws_url, additional_headers=headers)
+        # Kalshi's feed is trusted: skip permessage-deflate and the frame size cap.
+        self._ws = await websockets.connect(
+            self._ws_url,
+            additional_headers=headers,
+            compression=None,
+            max_size=None,
+        )
         self._running = True
         log.info("websocket_connected", url=self._ws_url)
 
@@ -109,11 +116,11 @@ class KalshiWebSocket:
         """Main loop: read messages and dispatch to registered callbacks."""
         while self._running and self._ws:
             try:
-                raw = await self._ws.recv()
-                data = json.loads(raw)
+                # Raw bytes skip the UTF-8 decode; orjson parses them directly.
+                raw = await self._ws.recv(decode=False)
+                data = orjson.loads(raw)
                 channel = data.get("type", "")
-                callbacks = self._callbacks.get(channel, [])
-                for cb in callbacks:
+                for cb in self._dispatch.get(channel, ()):
                     try:
                         await cb(data)
                     except Exception:
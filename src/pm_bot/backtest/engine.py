@@ -2,19 +2,66 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+from bisect import bisect_left
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 
-from pm_bot.api.models import Market, MarketStatus, OrderBook, OrderBookLevel
-from pm_bot.data.models import MarketRecord, OrderBookSnapshot
+import numpy as np
+
+from pm_bot.api.models import Action, Market, MarketStatus, OrderBook, OrderBookLevel
+from pm_bot.backtest.kernels import apply_fill_kernel, max_drawdown
+from pm_bot.data.columns import MarketColumns
+from pm_bot.data.levels import decode_levels
+from pm_bot.data.models import MarketRecord, MarketRow, OrderBookSnapshot
 from pm_bot.strategies.base import Strategy
 from pm_bot.utils.logging import get_logger
 
 log = get_logger("backtest.engine")
 
-
-@dataclass
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_MARKET_STATUSES = frozenset(s.value for s in MarketStatus)
+# Ordering key for records without a timestamp: they replay first.
+_NO_TIME = np.iinfo(np.int64).min
+# Replay input: rows streamed from the store, or full ORM records.
+_Record = MarketRow | MarketRecord
+# Records are prefiltered and timestamped in batches of this size.
+REPLAY_CHUNK = 1024
+
+
+def _epoch_ns(ts: datetime) -> int:
+    """Nanoseconds since the epoch; naive datetimes are treated as UTC."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // _ONE_US * 1000
+
+
+def _record_time(record: _Record) -> int:
+    return _NO_TIME if record.fetched_at is None else _epoch_ns(record.fetched_at)
+
+
+async def _chunked(
+    records: Iterable[_Record] | AsyncIterable[_Record], size: int
+) -> AsyncIterator[list[_Record]]:
+    if not isinstance(records, AsyncIterable):
+        it = iter(records)
+        while chunk := list(islice(it, size)):
+            yield chunk
+        return
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass(slots=True)
 class SimulatedFill:
     timestamp: datetime
     ticker: str
@@ -27,7 +74,7 @@ class SimulatedFill:
     pnl: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestPosition:
     ticker: str
     quantity: int = 0
@@ -36,45 +83,19 @@ class BacktestPosition:
 
     def apply_fill(self, action: str, price: int, quantity: int) -> float:
         """Apply a fill and return the realized PnL (0 if opening)."""
-        price_dollars = price / 100.0
-
-        if action == "buy":
-            new_qty = self.quantity + quantity
-            if self.quantity >= 0:
-                total_cost = self.avg_cost * self.quantity + price_dollars * quantity
-                self.avg_cost = total_cost / new_qty if new_qty > 0 else 0
-                self.quantity = new_qty
-                return 0.0
-            else:
-                closed = min(quantity, abs(self.quantity))
-                pnl = closed * (self.avg_cost - price_dollars)
-                self.realized_pnl += pnl
-                self.quantity = new_qty
-                if self.quantity > 0:
-                    self.avg_cost = price_dollars
-                return pnl
-        else:
-            new_qty = self.quantity - quantity
-            if self.quantity <= 0:
-                total_cost = abs(self.avg_cost * self.quantity) + price_dollars * quantity
-                self.avg_cost = total_cost / abs(new_qty) if new_qty != 0 else 0
-                self.quantity = new_qty
-                return 0.0
-            else:
-                closed = min(quantity, self.quantity)
-                pnl = closed * (price_dollars - self.avg_cost)
-                self.realized_pnl += pnl
-                self.quantity = new_qty
-                if self.quantity < 0:
-                    self.avg_cost = price_dollars
-                return pnl
+        self.quantity, self.avg_cost, self.realized_pnl, pnl = apply_fill_kernel(
+            self.quantity, self.avg_cost, self.realized_pnl, action == "buy", price, quantity
+        )
+        return pnl
 
 
 @dataclass
 class BacktestResult:
     fills: list[SimulatedFill] = field(default_factory=list)
     positions: dict[str, BacktestPosition] = field(default_factory=dict)
-    equity_curve: list[tuple[datetime, float]] = field(default_factory=list)
+    # Balance after each replayed record, filled in place by the engine.
+    equity_times: np.ndarray = field(default_factory=lambda: np.empty(0, dtype="datetime64[ns]"))
+    equity_values: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
     starting_balance: float = 10_000.0
     ending_balance: float = 10_000.0
 
@@ -101,17 +122,18 @@ class BacktestResult:
             return 0.0
         return sum(1 for f in closing if f.pnl > 0) / len(closing)
 
+    @property
+    def equity_curve(self) -> list[tuple[datetime, float]]:
+        """``(timestamp, balance)`` pairs, built on demand from the equity arrays."""
+        ns = self.equity_times.astype(np.int64).tolist()
+        return [
+            (_EPOCH + timedelta(microseconds=t // 1000), v)
+            for t, v in zip(ns, self.equity_values.tolist())
+        ]
+
     @property
     def max_drawdown(self) -> float:
-        if not self.equity_curve:
-            return 0.0
-        peak = self.equity_curve[0][1]
-        max_dd = 0.0
-        for _, equity in self.equity_curve:
-            peak = max(peak, equity)
-            dd = peak - equity
-            max_dd = max(max_dd, dd)
-        return max_dd
+        return float(max_drawdown(self.equity_values))
 
     @property
     def total_return_pct(self) -> float:
@@ -120,17 +142,139 @@ class BacktestResult:
         return ((self.ending_balance - self.starting_balance) / self.starting_balance) * 100
 
 
-def _snapshot_to_orderbook(snap: OrderBookSnapshot) -> OrderBook:
-    yes_levels = [OrderBookLevel(**lv) for lv in json.loads(snap.yes_levels_json)]
-    no_levels = [OrderBookLevel(**lv) for lv in json.loads(snap.no_levels_json)]
-    return OrderBook(yes=yes_levels, no=no_levels)
+class _SnapshotTableBuilder:
+    """Fills preallocated columns row by row, growing them geometrically if needed."""
 
+    def __init__(self, capacity: int) -> None:
+        capacity = max(capacity, 1)
+        self._ticker_ids: dict[str, int] = {}
+        self._ticker_id = np.empty(capacity, dtype=np.int32)
+        self._captured_at = np.empty(capacity, dtype=np.int64)
+        self._yes_levels: list[bytes] = []
+        self._no_levels: list[bytes] = []
+        self._n = 0
+
+    def add_rows(self, rows: Iterable[Sequence]) -> None:
+        ticker_ids = self._ticker_ids
+        for ticker, ts, yes_bin, no_bin in rows:
+            if ts is None:
+                continue
+            n = self._n
+            if n == len(self._ticker_id):
+                self._ticker_id = np.resize(self._ticker_id, 2 * n)
+                self._captured_at = np.resize(self._captured_at, 2 * n)
+            self._ticker_id[n] = ticker_ids.setdefault(ticker, len(ticker_ids))
+            self._captured_at[n] = _epoch_ns(ts)
+            self._yes_levels.append(yes_bin or b"")
+            self._no_levels.append(no_bin or b"")
+            self._n = n + 1
+
+    def build(self) -> SnapshotTable:
+        n = self._n
+        return SnapshotTable(
+            tickers=list(self._ticker_ids),
+            ticker_id=self._ticker_id[:n],
+            captured_at=self._captured_at[:n],
+            yes_levels=self._yes_levels,
+            no_levels=self._no_levels,
+        )
+
+
+@dataclass
+class SnapshotTable:
+    """Orderbook snapshots stored column-wise for replay.
+
+    ``ticker_id`` indexes into ``tickers``; ``captured_at`` holds epoch nanoseconds.
+    Level payloads stay packed (see ``pm_bot.data.levels``) and are only decoded
+    for snapshots a replay uses.
+    """
+
+    tickers: list[str]
+    ticker_id: np.ndarray
+    captured_at: np.ndarray
+    yes_levels: list[bytes]
+    no_levels: list[bytes]
+
+    def __len__(self) -> int:
+        return len(self.yes_levels)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Sequence[OrderBookSnapshot]) -> SnapshotTable:
+        builder = _SnapshotTableBuilder(len(snapshots))
+        builder.add_rows(
+            (s.ticker, s.captured_at, s.yes_levels_bin, s.no_levels_bin) for s in snapshots
+        )
+        return builder.build()
+
+    @classmethod
+    async def from_chunks(
+        cls,
+        chunks: AsyncIterable[Sequence[Sequence]],
+        capacity: int = 1024,
+        prefetch: int = 4,
+    ) -> SnapshotTable:
+        """Build from chunks of rows shaped like ``DataStore.iter_orderbook_snapshots``'.
+
+        A producer task keeps up to ``prefetch`` chunks queued, so fetching the
+        next chunk overlaps with filling columns from the current one.
+        """
+        queue: asyncio.Queue[Sequence[Sequence] | None] = asyncio.Queue(maxsize=prefetch)
+
+        async def produce() -> None:
+            try:
+                async for rows in chunks:
+                    await queue.put(rows)
+            except BaseException:
+                # Stopped early, so the queued rows are moot; and when cancelled the
+                # consumer has stopped reading. Make room for the end marker rather
+                # than block on a full queue.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                raise
+            await queue.put(None)
+
+        builder = _SnapshotTableBuilder(capacity)
+        producer = asyncio.create_task(produce())
+        try:
+            while (rows := await queue.get()) is not None:
+                builder.add_rows(rows)
+            await producer  # re-raises whatever stopped it
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+        return builder.build()
+
+    def orderbook(self, i: int) -> OrderBook:
+        return OrderBook(
+            yes=_decode_side(self.yes_levels[i]),
+            no=_decode_side(self.no_levels[i]),
+        )
 
-def _record_to_market(rec: MarketRecord) -> Market:
-    return Market(
+    def top_of_book(self, i: int) -> OrderBook:
+        """Orderbook ``i`` truncated to its best level per side."""
+        return OrderBook.model_construct(
+            yes=_decode_top(self.yes_levels[i]),
+            no=_decode_top(self.no_levels[i]),
+        )
+
+
+def _decode_side(payload: bytes) -> list[OrderBookLevel]:
+    return [OrderBookLevel(p, q) for p, q in decode_levels(payload).tolist()]
+
+
+def _decode_top(payload: bytes) -> list[OrderBookLevel]:
+    levels = decode_levels(payload)
+    return [OrderBookLevel(*levels[0].tolist())] if len(levels) else []
+
+
+def _record_to_market(rec: _Record) -> Market:
+    # Stored records were validated on the way in, so skip re-validation here.
+    return Market.model_construct(
         ticker=rec.ticker,
         title=rec.title,
-        status=(MarketStatus(rec.status) if rec.status and rec.status in [s.value for s in MarketStatus] else MarketStatus.ACTIVE),
+        status=rec.status if rec.status in _MARKET_STATUSES else MarketStatus.ACTIVE.value,
         event_ticker=rec.event_ticker,
         category=rec.category,
         yes_bid=rec.yes_bid,
@@ -158,80 +302,146 @@ class BacktestEngine:
 
     async def run(
         self,
-        market_records: list[MarketRecord],
-        orderbook_snapshots: list[OrderBookSnapshot],
+        market_records: Iterable[_Record] | AsyncIterable[_Record],
+        snapshots: SnapshotTable,
     ) -> BacktestResult:
+        """Replay ``market_records`` against ``snapshots``.
+
+        Records replay in ``fetched_at`` order, records without one first. A list (or
+        other sequence) is sorted into that order, as it always was; any other
+        iterable is streamed and must already arrive in it, as
+        ``DataStore.iter_market_records`` yields them, or ``ValueError`` is raised.
+        They are consumed in batches: each strategy's ``record_mask`` prefilters a
+        whole batch at once, and only rows some strategy wants are replayed one by one.
+        """
+        if isinstance(market_records, Sequence):
+            market_records = sorted(market_records, key=_record_time)
         result = BacktestResult(starting_balance=self._starting_balance)
         balance = self._starting_balance
-
-        ob_by_ticker: dict[str, list[OrderBookSnapshot]] = {}
-        for snap in orderbook_snapshots:
-            ob_by_ticker.setdefault(snap.ticker, []).append(snap)
-
-        sorted_records = sorted(market_records, key=lambda r: r.fetched_at or datetime.min)
-
-        for record in sorted_records:
-            market = _record_to_market(record)
-            snaps = ob_by_ticker.get(record.ticker, [])
-            closest_snap = self._find_closest_snapshot(snaps, record.fetched_at)
-
-            if closest_snap is None:
-                orderbook = OrderBook()
-            else:
-                orderbook = _snapshot_to_orderbook(closest_snap)
-
-            for strategy in self._strategies:
-                if not strategy.should_trade(market):
-                    continue
-
-                try:
-                    signals = await strategy.on_market_update(market, orderbook)
-                except Exception:
-                    log.exception("backtest_strategy_error", strategy=strategy.name)
-                    continue
-
-                for signal in signals:
-                    fill_price = signal.price
-                    if signal.action.value == "buy":
-                        fill_price += self._slippage
-                    else:
-                        fill_price -= self._slippage
-                    fill_price = max(1, min(99, fill_price))
-
-                    cost = fill_price / 100.0 * signal.quantity
-                    if signal.action.value == "buy" and balance < cost:
-                        continue
-
-                    pos = result.positions.setdefault(
-                        signal.market_ticker,
-                        BacktestPosition(ticker=signal.market_ticker),
-                    )
-                    pnl = pos.apply_fill(signal.action.value, fill_price, signal.quantity)
-
-                    if signal.action.value == "buy":
-                        balance -= cost
-                    else:
-                        balance += fill_price / 100.0 * signal.quantity
-
-                    balance += pnl
-
-                    fill = SimulatedFill(
-                        timestamp=record.fetched_at or datetime.now(timezone.utc),
-                        ticker=signal.market_ticker,
-                        action=signal.action.value,
-                        side=signal.side.value,
-                        price=fill_price,
-                        quantity=signal.quantity,
-                        strategy=signal.strategy_name,
-                        reason=signal.reason,
-                        pnl=pnl,
+        slippage = self._slippage
+        positions = result.positions
+        all_strategies = self._strategies
+
+        groups = self._group_by_ticker(snapshots)
+        decode_book = (
+            snapshots.orderbook
+            if any(s.needs_depth for s in all_strategies)
+            else snapshots.top_of_book
+        )
+        empty_book = OrderBook()
+        untimed_at = _epoch_ns(datetime.now(timezone.utc))
+        capacity = len(market_records) if isinstance(market_records, Sequence) else 1024
+        equity_times = np.empty(max(capacity, 1), dtype=np.int64)
+        equity_values = np.empty(max(capacity, 1), dtype=np.float64)
+        last_at = _NO_TIME
+        step = 0
+        # Consecutive records often share a closest snapshot; decode each one once.
+        books: dict[int, OrderBook] = {}
+        # Indices of the strategies watching each ticker, in configured order.
+        watchers: dict[str, list[int]] = {}
+
+        async for records in _chunked(market_records, REPLAY_CHUNK):
+            n = len(records)
+            fetched_at = np.fromiter(map(_record_time, records), dtype=np.int64, count=n)
+            # Compared pairwise, not with np.diff, which overflows next to _NO_TIME.
+            if fetched_at[0] < last_at or (fetched_at[1:] < fetched_at[:-1]).any():
+                raise ValueError("market records must be ordered by fetched_at")
+            last_at = int(fetched_at[-1])
+
+            if step + n > len(equity_values):
+                size = max(2 * len(equity_values), step + n)
+                equity_times = np.resize(equity_times, size)
+                equity_values = np.resize(equity_values, size)
+            equity_times[step : step + n] = np.where(fetched_at != _NO_TIME, fetched_at, untimed_at)
+
+            # Cheap record-level checks first, a whole batch at a time: rows no strategy
+            # wants never get a Market built or an orderbook decoded. A mask of None
+            # means that strategy checks rows individually.
+            columns = MarketColumns(records)
+            masks = [s.record_mask(columns) for s in all_strategies]
+            wanted = np.zeros(n, dtype=bool)
+            for mask in masks:
+                if mask is None:
+                    wanted[:] = True
+                    break
+                wanted |= mask
+
+            done = 0
+            for i in np.flatnonzero(wanted).tolist():
+                equity_values[step + done : step + i] = balance
+                done = i + 1
+                record = records[i]
+
+                candidates = watchers.get(record.ticker)
+                if candidates is None:
+                    candidates = watchers[record.ticker] = [
+                        k for k, s in enumerate(all_strategies) if s.watches(record.ticker)
+                    ]
+                strategies = [
+                    all_strategies[k]
+                    for k in candidates
+                    if (
+                        all_strategies[k].should_trade_record(record)
+                        if masks[k] is None
+                        else masks[k][i]
                     )
-                    result.fills.append(fill)
-
-            result.equity_curve.append(
-                (record.fetched_at or datetime.now(timezone.utc), balance)
-            )
-
+                ]
+                if strategies:
+                    market = _record_to_market(record)
+                    snap = self._closest_snapshot(groups.get(record.ticker), int(fetched_at[i]))
+                    if snap < 0:
+                        orderbook = empty_book
+                    elif (orderbook := books.get(snap)) is None:
+                        orderbook = books[snap] = decode_book(snap)
+                    for strategy in strategies:
+                        if not strategy.should_trade(market):
+                            continue
+
+                        try:
+                            signals = await strategy.on_market_update(market, orderbook)
+                        except Exception:
+                            log.exception("backtest_strategy_error", strategy=strategy.name)
+                            continue
+
+                        for signal in signals:
+                            is_buy = signal.action is Action.BUY
+                            ticker = signal.market_ticker
+                            qty = signal.quantity
+                            fill_price = signal.price + (slippage if is_buy else -slippage)
+                            fill_price = max(1, min(99, fill_price))
+
+                            cost = fill_price / 100.0 * qty
+                            if is_buy and balance < cost:
+                                continue
+
+                            pos = positions.get(ticker)
+                            if pos is None:
+                                pos = positions[ticker] = BacktestPosition(ticker=ticker)
+                            action = signal.action.value
+                            pnl = pos.apply_fill(action, fill_price, qty)
+
+                            balance += -cost if is_buy else cost
+                            balance += pnl
+
+                            fill = SimulatedFill(
+                                timestamp=record.fetched_at or datetime.now(timezone.utc),
+                                ticker=ticker,
+                                action=action,
+                                side=signal.side.value,
+                                price=fill_price,
+                                quantity=qty,
+                                strategy=signal.strategy_name,
+                                reason=signal.reason,
+                                pnl=pnl,
+                            )
+                            result.fills.append(fill)
+
+                equity_values[step + i] = balance
+            equity_values[step + done : step + n] = balance
+            step += n
+
+        result.equity_times = equity_times[:step].astype("datetime64[ns]")
+        result.equity_values = equity_values[:step]
         result.ending_balance = balance
         log.info(
             "backtest_complete",
@@ -243,21 +453,34 @@ class BacktestEngine:
         return result
 
     @staticmethod
-    def _find_closest_snapshot(
-        snapshots: list[OrderBookSnapshot],
-        target_time: datetime | None,
-    ) -> OrderBookSnapshot | None:
-        if not snapshots:
-            return None
-        if target_time is None:
-            return snapshots[0]
-        best = snapshots[0]
-        best_diff = abs((best.captured_at - target_time).total_seconds()) if best.captured_at else float("inf")
-        for snap in snapshots[1:]:
-            if snap.captured_at is None:
-                continue
-            diff = abs((snap.captured_at - target_time).total_seconds())
-            if diff < best_diff:
-                best = snap
-                best_diff = diff
-        return best
+    def _group_by_ticker(snapshots: SnapshotTable) -> dict[str, tuple[list[int], list[int]]]:
+        """Map each ticker to its snapshot row indices and their capture times.
+
+        Rows are sorted by ``captured_at`` once here so every lookup can bisect.
+        """
+        order = np.lexsort((snapshots.captured_at, snapshots.ticker_id))
+        counts = np.bincount(snapshots.ticker_id, minlength=len(snapshots.tickers))
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        return {
+            ticker: (rows.tolist(), snapshots.captured_at[rows].tolist())
+            for ticker, rows in zip(snapshots.tickers, groups)
+            if len(rows)
+        }
+
+    @staticmethod
+    def _closest_snapshot(group: tuple[list[int], list[int]] | None, fetched_at: int) -> int:
+        """Row index of the snapshot closest in time, or -1 if the ticker has none.
+
+        Ties go to the earlier snapshot; untimed records get the earliest.
+        """
+        if group is None:
+            return -1
+        rows, times = group
+        if fetched_at == _NO_TIME:
+            return rows[0]
+        i = bisect_left(times, fetched_at)
+        if i == len(times):
+            return rows[-1]
+        if i > 0 and fetched_at - times[i - 1] <= times[i] - fetched_at:
+            return rows[i - 1]
+        return rows[i]
@@ -0,0 +1,94 @@
+"""Numeric kernels for the backtester, compiled with Numba when it is installed.
+
+Kernels declare explicit signatures, so Numba compiles them eagerly at import and
+``cache=True`` persists the machine code; later runs load it instead of re-JITting
+on first call. Array arguments must be contiguous float64.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from pm_bot.utils.jit import HAVE_NUMBA, njit
+
+
+@njit("Tuple((i8, f8, f8, f8))(i8, f8, f8, b1, i8, i8)", cache=True)
+def apply_fill_kernel(
+    quantity: int,
+    avg_cost: float,
+    realized_pnl: float,
+    is_buy: bool,
+    price_cents: int,
+    fill_qty: int,
+) -> tuple[int, float, float, float]:
+    """Apply one fill to a position.
+
+    Returns ``(quantity, avg_cost, realized_pnl, pnl)`` where ``pnl`` is the PnL
+    realized by this fill (0 when it only opens or adds to the position).
+    """
+    price = price_cents / 100.0
+
+    if is_buy:
+        new_qty = quantity + fill_qty
+        if quantity >= 0:
+            total_cost = avg_cost * quantity + price * fill_qty
+            new_avg = total_cost / new_qty if new_qty > 0 else 0.0
+            return new_qty, new_avg, realized_pnl, 0.0
+        closed = min(fill_qty, -quantity)
+        pnl = closed * (avg_cost - price)
+        new_avg = price if new_qty > 0 else avg_cost
+        return new_qty, new_avg, realized_pnl + pnl, pnl
+
+    new_qty = quantity - fill_qty
+    if quantity <= 0:
+        total_cost = abs(avg_cost * quantity) + price * fill_qty
+        new_avg = total_cost / abs(new_qty) if new_qty != 0 else 0.0
+        return new_qty, new_avg, realized_pnl, 0.0
+    closed = min(fill_qty, quantity)
+    pnl = closed * (price - avg_cost)
+    new_avg = price if new_qty < 0 else avg_cost
+    return new_qty, new_avg, realized_pnl + pnl, pnl
+
+
+@njit("f8(f8[::1], f8)", cache=True)
+def sharpe_ratio(pnls: np.ndarray, annualization: float) -> float:
+    """Annualized Sharpe ratio of per-trade PnLs (sample std); 0 if undefined."""
+    n = len(pnls)
+    if n < 2:
+        return 0.0
+    mean = pnls.mean()
+    std = np.sqrt(((pnls - mean) ** 2).sum() / (n - 1))
+    if std <= 0.0:
+        return 0.0
+    return mean / std * annualization
+
+
+@njit("f8[::1](f8[::1])", cache=True)
+def cumulative_pnl(pnls: np.ndarray) -> np.ndarray:
+    return np.cumsum(pnls)
+
+
+if HAVE_NUMBA:
+
+    @njit("f8(f8[::1])", cache=True)
+    def max_drawdown(equities: np.ndarray) -> float:
+        """Largest peak-to-trough drop of an equity curve."""
+        if len(equities) == 0:
+            return 0.0
+        peak = equities[0]
+        max_dd = 0.0
+        for equity in equities:
+            if equity > peak:
+                peak = equity
+            elif peak - equity > max_dd:
+                max_dd = peak - equity
+        return max_dd
+
+else:
+
+    def max_drawdown(equities: np.ndarray) -> float:
+        """Largest peak-to-trough drop of an equity curve."""
+        # Numba cannot compile ufunc.accumulate, so only the interpreted path uses it.
+        if len(equities) == 0:
+            return 0.0
+        return float((np.maximum.accumulate(equities) - equities).max())
@@ -3,19 +3,22 @@
 from __future__ import annotations
 
 import math
+from collections import Counter
 from dataclasses import dataclass
 
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from rich.console import Console
 from rich.table import Table
 
 from pm_bot.backtest.engine import BacktestResult
+from pm_bot.backtest.kernels import cumulative_pnl, sharpe_ratio
 
 console = Console()
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestMetrics:
     total_trades: int = 0
     winning_trades: int = 0
@@ -30,15 +33,8 @@ class BacktestMetrics:
 
 
 def compute_metrics(result: BacktestResult) -> BacktestMetrics:
-    closing_fills = [f for f in result.fills if f.pnl != 0]
-    pnls = [f.pnl for f in closing_fills]
-
-    sharpe = 0.0
-    if len(pnls) > 1:
-        mean_pnl = sum(pnls) / len(pnls)
-        variance = sum((p - mean_pnl) ** 2 for p in pnls) / (len(pnls) - 1)
-        std = math.sqrt(variance) if variance > 0 else 0.0
-        sharpe = (mean_pnl / std) * math.sqrt(252) if std > 0 else 0.0
+    pnls = np.fromiter((f.pnl for f in result.fills if f.pnl != 0), dtype=np.float64)
+    sharpe = float(sharpe_ratio(pnls, math.sqrt(252)))
 
     return BacktestMetrics(
         total_trades=result.total_trades,
@@ -47,7 +43,7 @@ def compute_metrics(result: BacktestResult) -> BacktestMetrics:
         win_rate=result.win_rate,
         total_return_pct=result.total_return_pct,
         total_pnl=result.total_realized_pnl,
-        avg_pnl_per_trade=sum(pnls) / len(pnls) if pnls else 0.0,
+        avg_pnl_per_trade=float(pnls.mean()) if len(pnls) else 0.0,
         max_drawdown=result.max_drawdown,
         sharpe_ratio=sharpe,
     )
@@ -107,36 +103,31 @@ def generate_html_report(result: BacktestResult, output_path: str = "backtest_re
                [{"type": "scatter"}, {"type": "bar"}]],
     )
 
-    if result.equity_curve:
-        times, equities = zip(*result.equity_curve)
+    if len(result.equity_values):
         fig.add_trace(
-            go.Scatter(x=list(times), y=list(equities), mode="lines", name="Equity"),
+            go.Scatter(
+                x=result.equity_times, y=result.equity_values, mode="lines", name="Equity"
+            ),
             row=1, col=1,
         )
 
-    pnls = [f.pnl for f in result.fills if f.pnl != 0]
-    if pnls:
+    pnls = np.fromiter((f.pnl for f in result.fills if f.pnl != 0), dtype=np.float64)
+    if len(pnls):
         fig.add_trace(
             go.Histogram(x=pnls, nbinsx=30, name="PnL Distribution"),
             row=1, col=2,
         )
 
     if result.fills:
-        cum_pnl = []
-        running = 0.0
-        times_fills = []
-        for f in result.fills:
-            running += f.pnl
-            cum_pnl.append(running)
-            times_fills.append(f.timestamp)
+        fill_pnls = np.fromiter((f.pnl for f in result.fills), dtype=np.float64)
+        cum_pnl = cumulative_pnl(fill_pnls)
+        times_fills = [f.timestamp for f in result.fills]
         fig.add_trace(
             go.Scatter(x=times_fills, y=cum_pnl, mode="lines", name="Cumulative PnL"),
             row=2, col=1,
         )
 
-    strategy_counts: dict[str, int] = {}
-    for f in result.fills:
-        strategy_counts[f.strategy] = strategy_counts.get(f.strategy, 0) + 1
+    strategy_counts = Counter(f.strategy for f in result.fills)
     if strategy_counts:
         fig.add_trace(
             go.Bar(x=list(strategy_counts.keys()), y=list(strategy_counts.values()), name="Trades"),
@@ -149,6 +140,7 @@ def generate_html_report(result: BacktestResult, output_path: str = "backtest_re
         showlegend=False,
     )
 
-    fig.write_html(output_path)
+    # Load plotly.js from the CDN instead of inlining the ~3 MB bundle.
+    fig.write_html(output_path, include_plotlyjs="cdn")
     console.print(f"[green]Report saved to {output_path}[/green]")
     return output_path
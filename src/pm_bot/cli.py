@@ -3,17 +3,126 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import Self
 
 import click
 from rich.console import Console
 from rich.table import Table
 
 from pm_bot.config import get_settings
+from pm_bot.runtime import app_context
+from pm_bot.utils.aio import run as run_async
 from pm_bot.utils.logging import setup_logging
 
 console = Console()
 
 
+# Table layouts, built fresh per print since rich tables accumulate their rows.
+
+
+def _open_markets_table(env: str) -> Table:
+    table = Table(title=f"Open Markets ({env})")
+    table.add_column("Ticker", style="cyan")
+    table.add_column("Title", style="white")
+    table.add_column("Yes Bid", justify="right")
+    table.add_column("Yes Ask", justify="right")
+    table.add_column("Volume", justify="right", style="green")
+    return table
+
+
+def _orderbook_table(ticker: str) -> Table:
+    table = Table(title=f"Orderbook: {ticker}")
+    table.add_column("YES Bids (price x qty)", style="green")
+    table.add_column("NO Bids (price x qty)", style="red")
+    return table
+
+
+def _positions_table() -> Table:
+    table = Table(title="Positions")
+    table.add_column("Ticker", style="cyan")
+    table.add_column("Qty", justify="right")
+    table.add_column("Cost ($)", justify="right")
+    table.add_column("Realized PnL ($)", justify="right")
+    table.add_column("Fees ($)", justify="right")
+    return table
+
+
+def _stored_markets_table() -> Table:
+    table = Table(title="Stored Markets (latest snapshot)")
+    table.add_column("Ticker", style="cyan")
+    table.add_column("Title", style="white", max_width=50)
+    table.add_column("Last Price", justify="right")
+    table.add_column("Volume", justify="right", style="green")
+    table.add_column("Fetched At", style="dim")
+    return table
+
+
+def _price_history_table(ticker: str) -> Table:
+    table = Table(title=f"Price History: {ticker}")
+    table.add_column("Yes Price", justify="right", style="green")
+    table.add_column("Volume", justify="right")
+    table.add_column("Source", style="dim")
+    table.add_column("Time", style="dim")
+    return table
+
+
+def _print_pages(
+    new_table: Callable[[], Table], rows: Sequence[Sequence[str]], page_size: int
+) -> None:
+    """Print ``rows`` as consecutive tables of at most ``page_size`` rows each.
+
+    Rich measures every cell of a table to lay it out, so several small tables
+    render far faster than one table with thousands of rows.
+    """
+    for start in range(0, len(rows), page_size):
+        table = new_table()
+        for row in rows[start : start + page_size]:
+            table.add_row(*row)
+        console.print(table)
+
+
+class _LineQueue:
+    """Prints lines from a background task so callers never wait on the terminal.
+
+    Lines are printed up to ``batch`` per ``console.print`` call. When ``maxsize``
+    lines are already waiting, new ones are dropped rather than queued.
+    """
+
+    def __init__(self, maxsize: int = 1024, batch: int = 32) -> None:
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=maxsize)
+        self._batch = batch
+        self._printer: asyncio.Task | None = None
+
+    def put(self, line: str) -> None:
+        with contextlib.suppress(asyncio.QueueFull):
+            self._queue.put_nowait(line)
+
+    def _print_waiting(self, first: str) -> None:
+        lines = [first]
+        while len(lines) < self._batch and not self._queue.empty():
+            lines.append(self._queue.get_nowait())
+        console.print("\n".join(lines))
+
+    async def _print_forever(self) -> None:
+        while True:
+            self._print_waiting(await self._queue.get())
+
+    async def __aenter__(self) -> Self:
+        self._printer = asyncio.create_task(self._print_forever())
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        if self._printer is not None:
+            self._printer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._printer
+        while not self._queue.empty():
+            self._print_waiting(self._queue.get_nowait())
+
+
 @click.group()
 def cli() -> None:
     """Kalshi prediction market trading bot."""
@@ -24,134 +133,113 @@ def cli() -> None:
 @cli.command()
 def check() -> None:
     """Verify API connectivity by fetching open markets."""
-    asyncio.run(_check())
+    run_async(_check())
 
 
 async def _check() -> None:
-    from pm_bot.api.client import KalshiClient
-
-    settings = get_settings()
-    client = KalshiClient(settings)
-    try:
-        resp = await client.get_markets(limit=10)
-        table = Table(title=f"Open Markets ({settings.kalshi_env.value})")
-        table.add_column("Ticker", style="cyan")
-        table.add_column("Title", style="white")
-        table.add_column("Yes Bid", justify="right")
-        table.add_column("Yes Ask", justify="right")
-        table.add_column("Volume", justify="right", style="green")
-        for m in resp.markets:
-            table.add_row(m.ticker, m.title[:60], str(m.yes_bid), str(m.yes_ask), str(m.volume))
-        console.print(table)
-        console.print(f"\n[green]Connected to {settings.base_url}[/green]")
-    except Exception as e:
-        console.print(f"[red]Connection failed: {e}[/red]")
-    finally:
-        await client.close()
+    async with app_context() as ctx:
+        try:
+            resp = await ctx.client.get_markets(limit=10)
+            table = _open_markets_table(ctx.settings.kalshi_env.value)
+            for m in resp.markets:
+                table.add_row(
+                    m.ticker, m.title[:60], str(m.yes_bid), str(m.yes_ask), str(m.volume)
+                )
+            console.print(table)
+            console.print(f"\n[green]Connected to {ctx.settings.base_url}[/green]")
+        except Exception as e:
+            console.print(f"[red]Connection failed: {e}[/red]")
 
 
 @cli.command()
 @click.argument("ticker")
 def orderbook(ticker: str) -> None:
     """Show orderbook for a specific market ticker."""
-    asyncio.run(_orderbook(ticker))
+    run_async(_orderbook(ticker))
 
 
 async def _orderbook(ticker: str) -> None:
-    from pm_bot.api.client import KalshiClient
-
-    settings = get_settings()
-    client = KalshiClient(settings)
-    try:
-        resp = await client.get_orderbook(ticker)
-        ob = resp.orderbook
-        table = Table(title=f"Orderbook: {ticker}")
-        table.add_column("YES Bids (price x qty)", style="green")
-        table.add_column("NO Bids (price x qty)", style="red")
-        max_rows = max(len(ob.yes), len(ob.no))
-        for i in range(max_rows):
-            yes_str = f"{ob.yes[i].price}c x {ob.yes[i].quantity}" if i < len(ob.yes) else ""
-            no_str = f"{ob.no[i].price}c x {ob.no[i].quantity}" if i < len(ob.no) else ""
-            table.add_row(yes_str, no_str)
-        console.print(table)
-        console.print(f"Mid: {ob.mid_price}  Spread: {ob.spread}")
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        await client.close()
+    async with app_context() as ctx:
+        try:
+            resp = await ctx.client.get_orderbook(ticker)
+            ob = resp.orderbook
+            table = _orderbook_table(ticker)
+            max_rows = max(len(ob.yes), len(ob.no))
+            for i in range(max_rows):
+                yes_str = f"{ob.yes[i].price}c x {ob.yes[i].quantity}" if i < len(ob.yes) else ""
+                no_str = f"{ob.no[i].price}c x {ob.no[i].quantity}" if i < len(ob.no) else ""
+                table.add_row(yes_str, no_str)
+            console.print(table)
+            console.print(f"Mid: {ob.mid_price}  Spread: {ob.spread}")
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
 
 
 @cli.command()
 def balance() -> None:
     """Show portfolio balance."""
-    asyncio.run(_balance())
+    run_async(_balance())
 
 
 async def _balance() -> None:
-    from pm_bot.api.client import KalshiClient
-
-    settings = get_settings()
-    client = KalshiClient(settings)
-    try:
-        bal = await client.get_balance()
-        console.print(f"Balance: [green]${bal.balance_dollars:.2f}[/green]")
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        await client.close()
+    async with app_context() as ctx:
+        try:
+            bal = await ctx.client.get_balance()
+            console.print(f"Balance: [green]${bal.balance_dollars:.2f}[/green]")
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
 
 
 @cli.command()
 def positions() -> None:
     """Show current portfolio positions."""
-    asyncio.run(_positions())
+    run_async(_positions())
 
 
 async def _positions() -> None:
-    from pm_bot.api.client import KalshiClient
-
-    settings = get_settings()
-    client = KalshiClient(settings)
-    try:
-        resp = await client.get_positions()
-        if not resp.market_positions:
-            console.print("[yellow]No open positions.[/yellow]")
-            return
-        table = Table(title="Positions")
-        table.add_column("Ticker", style="cyan")
-        table.add_column("Qty", justify="right")
-        table.add_column("Cost ($)", justify="right")
-        table.add_column("Realized PnL ($)", justify="right")
-        table.add_column("Fees ($)", justify="right")
-        for p in resp.market_positions:
-            table.add_row(
-                p.market_ticker,
-                str(p.quantity),
-                f"{p.position_cost_dollars:.2f}",
-                f"{p.realized_pnl_dollars:.2f}",
-                f"{p.fees_paid_dollars:.2f}",
-            )
-        console.print(table)
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        await client.close()
+    async with app_context() as ctx:
+        try:
+            resp = await ctx.client.get_positions()
+            if not resp.market_positions:
+                console.print("[yellow]No open positions.[/yellow]")
+                return
+            table = _positions_table()
+            for p in resp.market_positions:
+                table.add_row(
+                    p.market_ticker,
+                    str(p.quantity),
+                    f"{p.position_cost_dollars:.2f}",
+                    f"{p.realized_pnl_dollars:.2f}",
+                    f"{p.fees_paid_dollars:.2f}",
+                )
+            console.print(table)
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
 
 
 @cli.command()
 def init_db() -> None:
     """Initialize the database tables."""
-    asyncio.run(_init_db())
+    run_async(_init_db())
 
 
 async def _init_db() -> None:
-    from pm_bot.data.store import DataStore
+    async with app_context() as ctx:
+        await ctx.store.init_db()
+        console.print("[green]Database initialized.[/green]")
 
-    settings = get_settings()
-    store = DataStore(settings.db_url)
-    await store.init_db()
-    console.print("[green]Database initialized.[/green]")
-    await store.close()
+
+@cli.command()
+def clear_level_json() -> None:
+    """Drop the legacy JSON levels of snapshots already stored in binary."""
+    run_async(_clear_level_json())
+
+
+async def _clear_level_json() -> None:
+    async with app_context() as ctx:
+        await ctx.store.init_db()
+        cleared = await ctx.store.clear_level_json()
+        console.print(f"[green]Cleared JSON levels of {cleared} snapshots.[/green]")
 
 
 # --- Phase 1: Data pipeline commands ---
@@ -161,96 +249,78 @@ async def _init_db() -> None:
 @click.option("--interval", default=15, help="Poll interval in seconds.")
 def scan(interval: int) -> None:
     """Run the market scanner continuously."""
-    asyncio.run(_scan(interval))
+    run_async(_scan(interval))
 
 
 async def _scan(interval: int) -> None:
-    from pm_bot.api.client import KalshiClient
-    from pm_bot.data.store import DataStore
     from pm_bot.engine.scanner import MarketScanner
 
-    settings = get_settings()
-    client = KalshiClient(settings)
-    store = DataStore(settings.db_url)
-    await store.init_db()
-    scanner = MarketScanner(client, store, poll_interval=interval)
-    try:
-        console.print(f"[cyan]Scanner started (poll every {interval}s)...[/cyan]")
-        await scanner.run()
-    except KeyboardInterrupt:
-        scanner.stop()
-    finally:
-        await client.close()
-        await store.close()
+    async with app_context() as ctx:
+        await ctx.store.init_db()
+        scanner = MarketScanner(ctx.client, ctx.store, poll_interval=interval)
+        try:
+            console.print(f"[cyan]Scanner started (poll every {interval}s)...[/cyan]")
+            await scanner.run()
+        except KeyboardInterrupt:
+            scanner.stop()
 
 
 @cli.command()
 @click.option("--limit", default=20, help="Number of markets to show.")
-def top_markets(limit: int) -> None:
+@click.option("--page-size", default=500, type=click.IntRange(min=1),
+              help="Rows per printed table.")
+def top_markets(limit: int, page_size: int) -> None:
     """Show top stored markets by volume."""
-    asyncio.run(_top_markets(limit))
-
+    run_async(_top_markets(limit, page_size))
 
-async def _top_markets(limit: int) -> None:
-    from pm_bot.data.store import DataStore
 
-    settings = get_settings()
-    store = DataStore(settings.db_url)
-    records = await store.get_latest_markets(limit=limit)
+async def _top_markets(limit: int, page_size: int) -> None:
+    async with app_context() as ctx:
+        records = await ctx.store.get_latest_markets(limit=limit)
     if not records:
         console.print("[yellow]No markets in DB. Run 'scan' first.[/yellow]")
-        await store.close()
         return
-    table = Table(title="Stored Markets (latest snapshot)")
-    table.add_column("Ticker", style="cyan")
-    table.add_column("Title", style="white", max_width=50)
-    table.add_column("Last Price", justify="right")
-    table.add_column("Volume", justify="right", style="green")
-    table.add_column("Fetched At", style="dim")
-    for r in records:
-        table.add_row(
+
+    rows = [
+        (
             r.ticker,
             r.title[:50],
             str(r.last_price),
             str(r.volume),
             r.fetched_at.strftime("%Y-%m-%d %H:%M") if r.fetched_at else "",
         )
-    console.print(table)
-    await store.close()
+        for r in records
+    ]
+    _print_pages(_stored_markets_table, rows, page_size)
 
 
 @cli.command()
 @click.argument("ticker")
 @click.option("--limit", default=50, help="Number of price records to show.")
-def price_history(ticker: str, limit: int) -> None:
+@click.option("--page-size", default=500, type=click.IntRange(min=1),
+              help="Rows per printed table.")
+def price_history(ticker: str, limit: int, page_size: int) -> None:
     """Show price history for a market ticker."""
-    asyncio.run(_price_history(ticker, limit))
-
+    run_async(_price_history(ticker, limit, page_size))
 
-async def _price_history(ticker: str, limit: int) -> None:
-    from pm_bot.data.store import DataStore
 
-    settings = get_settings()
-    store = DataStore(settings.db_url)
-    records = await store.get_price_history(ticker, limit=limit)
+async def _price_history(ticker: str, limit: int, page_size: int) -> None:
+    async with app_context() as ctx:
+        records = await ctx.store.get_price_history(ticker, limit=limit)
     if not records:
         console.print(f"[yellow]No price data for {ticker}.[/yellow]")
-        await store.close()
         return
-    table = Table(title=f"Price History: {ticker}")
-    table.add_column("Yes Price", justify="right", style="green")
-    table.add_column("Volume", justify="right")
-    table.add_column("Source", style="dim")
-    table.add_column("Time", style="dim")
-    for r in records:
-        table.add_row(
+
+    rows = [
+        (
             str(r.yes_price),
             str(r.volume),
             r.source,
             r.captured_at.strftime("%Y-%m-%d %H:%M:%S") if r.captured_at else "",
         )
-    console.print(table)
-    await store.close()
+        for r in records
+    ]
+    _print_pages(partial(_price_history_table, ticker), rows, page_size)
 
 
 @cli.command()
@@ -259,47 +329,44 @@ async def _price_history(ticker: str, limit: int) -> None:
               help="WebSocket channels to subscribe to.")
 def stream(tickers: tuple[str, ...], channel: tuple[str, ...]) -> None:
     """Stream real-time data via WebSocket for given market tickers."""
-    asyncio.run(_stream(list(tickers), list(channel)))
+    run_async(_stream(list(tickers), list(channel)))
 
 
 async def _stream(tickers: list[str], channels: list[str]) -> None:
     from pm_bot.api.websocket import KalshiWebSocket
-    from pm_bot.data.store import DataStore
 
-    settings = get_settings()
-    store = DataStore(settings.db_url)
-    await store.init_db()
-    ws = KalshiWebSocket(settings)
-
-    async def on_ticker(data: dict) -> None:
-        msg = data.get("msg", {})
-        ticker = msg.get("market_ticker", "")
-        price = msg.get("yes_price") or msg.get("price", 0)
-        volume = msg.get("volume", 0)
-        console.print(f"  [cyan]TICK[/cyan] {ticker}: {price}c  vol={volume}")
-        if ticker and price:
-            await store.save_price(ticker, price, volume, source="ws_ticker")
-
-    async def on_trade(data: dict) -> None:
-        msg = data.get("msg", {})
-        ticker = msg.get("market_ticker", "")
-        price = msg.get("yes_price", 0)
-        count = msg.get("count", 0)
-        console.print(f"  [green]TRADE[/green] {ticker}: {price}c x{count}")
-        if ticker and price:
-            await store.save_price(ticker, price, count, source="ws_trade")
-
-    ws.on("ticker", on_ticker)
-    ws.on("trade", on_trade)
-
-    console.print(f"[cyan]Streaming {channels} for {tickers or 'all'}...[/cyan]")
-    try:
-        await ws.run(channels, market_tickers=list(tickers) if tickers else None)
-    except KeyboardInterrupt:
-        pass
-    finally:
-        await ws.disconnect()
-        await store.close()
+    async with app_context() as ctx, _LineQueue() as out:
+        await ctx.store.init_db()
+        ws = KalshiWebSocket(ctx.settings)
+
+        async def on_ticker(data: dict) -> None:
+            msg = data.get("msg", {})
+            ticker = msg.get("market_ticker", "")
+            price = msg.get("yes_price") or msg.get("price", 0)
+            volume = msg.get("volume", 0)
+            out.put(f"  [cyan]TICK[/cyan] {ticker}: {price}c  vol={volume}")
+            if ticker and price:
+                await ctx.store.save_price(ticker, price, volume, source="ws_ticker")
+
+        async def on_trade(data: dict) -> None:
+            msg = data.get("msg", {})
+            ticker = msg.get("market_ticker", "")
+            price = msg.get("yes_price", 0)
+            count = msg.get("count", 0)
+            out.put(f"  [green]TRADE[/green] {ticker}: {price}c x{count}")
+            if ticker and price:
+                await ctx.store.save_price(ticker, price, count, source="ws_trade")
+
+        ws.on("ticker", on_ticker)
+        ws.on("trade", on_trade)
+
+        console.print(f"[cyan]Streaming {channels} for {tickers or 'all'}...[/cyan]")
+        try:
+            await ws.run(channels, market_tickers=list(tickers) if tickers else None)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            await ws.disconnect()
 
 
 # --- Backtest (Phase 5) ---
@@ -309,50 +376,52 @@ async def _stream(tickers: list[str], channels: list[str]) -> None:
 @click.option("--strategy", "-s", default="naive_value", help="Strategy to backtest.")
 @click.option("--balance", default=10000.0, help="Starting balance.")
 @click.option("--html", "html_output", is_flag=True, help="Generate HTML report.")
-def backtest(strategy: str, balance: float, html_output: bool) -> None:
+@click.option("--limit", default=5000, help="Number of most recent market records to replay.")
+@click.option("--snapshot-limit", default=10000, help="Number of orderbook snapshots to load.")
+def backtest(
+    strategy: str, balance: float, html_output: bool, limit: int, snapshot_limit: int
+) -> None:
     """Run a backtest against stored historical data."""
-    asyncio.run(_backtest(strategy, balance, html_output))
-
+    run_async(_backtest(strategy, balance, html_output, limit, snapshot_limit))
 
-async def _backtest(strategy_name: str, balance: float, html_output: bool) -> None:
-    from sqlmodel import select
-    from sqlmodel.ext.asyncio.session import AsyncSession
 
-    from pm_bot.backtest.engine import BacktestEngine
+async def _backtest(
+    strategy_name: str,
+    balance: float,
+    html_output: bool,
+    limit: int,
+    snapshot_limit: int,
+) -> None:
+    from pm_bot.backtest.engine import BacktestEngine, SnapshotTable
     from pm_bot.backtest.report import generate_html_report, print_report
-    from pm_bot.data.models import OrderBookSnapshot
-    from pm_bot.data.store import DataStore
     from pm_bot.engine.bot import STRATEGY_REGISTRY, _load_strategies
 
-    settings = get_settings()
-    store = DataStore(settings.db_url)
-
-    market_records = await store.get_latest_markets(limit=5000)
-    if not market_records:
-        console.print("[yellow]No market data in DB. Run 'scan' first.[/yellow]")
-        await store.close()
-        return
-
-    async with AsyncSession(store._engine) as session:
-        result = await session.exec(select(OrderBookSnapshot).limit(10000))
-        snapshots = list(result.all())
-
     _load_strategies()
     cls = STRATEGY_REGISTRY.get(strategy_name)
     if cls is None:
         console.print(f"[red]Unknown strategy: {strategy_name}[/red]")
         console.print(f"Available: {list(STRATEGY_REGISTRY.keys())}")
-        await store.close()
         return
 
-    strategies = [cls()]
-    engine = BacktestEngine(strategies=strategies, starting_balance=balance)
-    bt_result = await engine.run(market_records, snapshots)
+    async with app_context() as ctx:
+        store = ctx.store
+        await store.init_db()
+        snapshots = await SnapshotTable.from_chunks(
+            store.iter_orderbook_snapshots(limit=snapshot_limit, chunk_size=500),
+            capacity=snapshot_limit,
+        )
+
+        strategies = [cls()]
+        engine = BacktestEngine(strategies=strategies, starting_balance=balance)
+        bt_result = await engine.run(store.iter_market_records(limit=limit), snapshots)
+
+    if not len(bt_result.equity_values):
+        console.print("[yellow]No market data in DB. Run 'scan' first.[/yellow]")
+        return
 
     print_report(bt_result)
     if html_output:
         generate_html_report(bt_result)
-    await store.close()
 
 
 # --- Bot runner (Phase 2+) ---
@@ -363,29 +432,27 @@ async def _backtest(strategy_name: str, balance: float, html_output: bool) -> No
               help="Strategies to run.")
 def run(strategy: tuple[str, ...]) -> None:
     """Run the trading bot with specified strategies."""
-    asyncio.run(_run_bot(list(strategy)))
+    run_async(_run_bot(list(strategy)))
 
 
 async def _run_bot(strategy_names: list[str]) -> None:
-    from pm_bot.api.client import KalshiClient
-    from pm_bot.data.store import DataStore
     from pm_bot.engine.bot import Bot
 
-    settings = get_settings()
-    client = KalshiClient(settings)
-    store = DataStore(settings.db_url)
-    await store.init_db()
-
-    bot = Bot(client=client, store=store, settings=settings, strategy_names=strategy_names)
-    try:
-        console.print(f"[cyan]Bot starting with strategies: {strategy_names}[/cyan]")
-        await bot.run()
-    except KeyboardInterrupt:
-        console.print("[yellow]Shutting down...[/yellow]")
-    finally:
-        await bot.shutdown()
-        await client.close()
-        await store.close()
+    async with app_context() as ctx:
+        await ctx.store.init_db()
+        bot = Bot(
+            client=ctx.client,
+            store=ctx.store,
+            settings=ctx.settings,
+            strategy_names=strategy_names,
+        )
+        try:
+            console.print(f"[cyan]Bot starting with strategies: {strategy_names}[/cyan]")
+            await bot.run()
+        except KeyboardInterrupt:
+            console.print("[yellow]Shutting down...[/yellow]")
+        finally:
+            await bot.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from enum import Enum
+from functools import cached_property, lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pydantic import Field
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+
 
 class Environment(str, Enum):
     DEMO = "demo"
@@ -22,16 +27,26 @@ _WS_URLS = {
     Environment.PRODUCTION: "wss://api.elections.kalshi.com/trade-api/ws/v2",
 }
 
+# Named event_loop choices; anything else must be "module:factory".
+_EVENT_LOOPS = ("auto", "asyncio", "uvloop", "winloop")
+
 
 class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+    # Frozen: one instance is shared through get_settings, and the cached
+    # properties below must not go stale.
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", frozen=True)
 
     kalshi_api_key_id: str = ""
     kalshi_private_key_path: Path = Path("private_key.pem")
     kalshi_env: Environment = Environment.DEMO
 
     db_url: str = "sqlite+aiosqlite:///pm_bot.db"
+    # SQLite PRAGMAs set on each connection, over pm_bot.data.store.SQLITE_PRAGMAS.
+    db_pragmas: dict[str, str | int] = {}
     log_level: str = "INFO"
+    # "auto" (uvloop, or winloop on Windows, if installed), "asyncio", "uvloop",
+    # "winloop", or "module:factory" naming any callable that returns a new event loop.
+    event_loop: str = "auto"
 
     # Risk defaults
     max_position_per_market: int = 100
@@ -40,26 +55,45 @@ class Settings(BaseSettings):
 
     # Scanner defaults
     scanner_poll_interval_seconds: int = 15
+    # Orderbook fetches the strategy engine keeps in flight at once.
+    orderbook_concurrency: int = 8
 
     # Weather provider API keys
     openweathermap_api_key: str = ""
     tomorrowio_api_key: str = ""
 
-    @property
+    @field_validator("event_loop")
+    @classmethod
+    def _check_event_loop(cls, value: str) -> str:
+        if value in _EVENT_LOOPS:
+            return value
+        module, sep, attr = value.partition(":")
+        if not (sep and module and attr):
+            raise ValueError(
+                f"must be one of {', '.join(_EVENT_LOOPS)} or 'module:factory', got {value!r}"
+            )
+        return value
+
+    @cached_property
     def base_url(self) -> str:
         return _BASE_URLS[self.kalshi_env]
 
-    @property
+    @cached_property
     def ws_url(self) -> str:
         return _WS_URLS[self.kalshi_env]
 
-    @property
+    @cached_property
     def private_key_pem(self) -> str:
         return self.kalshi_private_key_path.read_text()
 
+    @cached_property
+    def private_key(self) -> RSAPrivateKey:
+        """The parsed signing key, shared by the REST and WebSocket clients."""
+        from cryptography.hazmat.primitives.serialization import load_pem_private_key
 
-settings = Field(default_factory=Settings)
+        return load_pem_private_key(self.private_key_pem.encode(), password=None)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings()
@@ -3,37 +3,44 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 from sqlmodel import select
-from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
 
 from pm_bot.config import get_settings
 from pm_bot.data.models import (
     MarketRecord,
     OrderRecord,
-    PriceRecord,
     StrategySignalRecord,
 )
+from pm_bot.data.store import DataStore
 
 
-def run_async(coro):
+@st.cache_resource
+def _loop():
+    # One loop for the whole server, running on its own thread. The store's connection
+    # pool is bound to the loop that first used it, and Streamlit runs every session's
+    # script on a thread of its own, so each of them submits work to this loop.
     loop = asyncio.new_event_loop()
-    return loop.run_until_complete(coro)
+    threading.Thread(target=loop.run_forever, name="dashboard-loop", daemon=True).start()
+    return loop
+
+
+def run_async(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _loop()).result()
 
 
 @st.cache_resource
-def get_engine():
+def get_store():
     settings = get_settings()
-    return create_async_engine(settings.db_url, echo=False)
+    return DataStore(settings.db_url, settings.db_pragmas)
 
 
-async def _fetch_records(model, limit=200, order_col=None):
-    engine = get_engine()
-    async with AsyncSession(engine) as session:
+async def _fetch_records(store, model, limit=200, order_col=None):
+    async with store.session() as session:
         stmt = select(model)
         if order_col is not None:
             stmt = stmt.order_by(order_col.desc())
@@ -42,8 +49,25 @@ async def _fetch_records(model, limit=200, order_col=None):
         return list(result.all())
 
 
-def fetch_records(model, limit=200, order_col=None):
-    return run_async(_fetch_records(model, limit, order_col))
+async def _load_overview(store):
+    # Each query gets its own pooled connection, so they run concurrently.
+    return await asyncio.gather(
+        store.count(OrderRecord),
+        store.count(StrategySignalRecord),
+        store.count(StrategySignalRecord, StrategySignalRecord.executed.is_(True)),
+        store.count_distinct(MarketRecord.ticker),
+        _fetch_records(store, OrderRecord, limit=200, order_col=OrderRecord.created_at),
+        _fetch_records(
+            store, StrategySignalRecord, limit=200, order_col=StrategySignalRecord.created_at
+        ),
+        _fetch_records(store, MarketRecord, limit=100, order_col=MarketRecord.fetched_at),
+        store.count_by_hour(OrderRecord.created_at),
+    )
+
+
+@st.cache_data(ttl=5)
+def load_overview():
+    return run_async(_load_overview(get_store()))
 
 
 # --- Page config ---
@@ -58,43 +82,32 @@ tab_overview, tab_markets, tab_orders, tab_signals, tab_prices = st.tabs(
 with tab_overview:
     col1, col2, col3, col4 = st.columns(4)
 
-    orders = fetch_records(OrderRecord, limit=10000, order_col=OrderRecord.created_at)
-    signals = fetch_records(StrategySignalRecord, limit=10000, order_col=StrategySignalRecord.created_at)
-    markets = fetch_records(MarketRecord, limit=500, order_col=MarketRecord.fetched_at)
-
-    col1.metric("Total Orders", len(orders))
-    col2.metric("Total Signals", len(signals))
-    col3.metric("Signals Executed", sum(1 for s in signals if s.executed))
-    col4.metric("Markets Tracked", len(set(m.ticker for m in markets)))
-
-    if orders:
-        df_orders = pd.DataFrame([{
-            "time": o.created_at,
-            "ticker": o.ticker,
-            "action": o.action,
-            "side": o.side,
-            "status": o.status,
-            "strategy": o.strategy,
-        } for o in orders])
-        if not df_orders.empty and "time" in df_orders.columns:
-            df_orders["time"] = pd.to_datetime(df_orders["time"])
-            daily = df_orders.set_index("time").resample("h").size()
-            st.subheader("Orders per Hour")
-            st.bar_chart(daily)
+    # Counts plus only the rows the other tabs display.
+    (
+        n_orders, n_signals, n_executed, n_markets, orders, signals, markets, hourly
+    ) = load_overview()
+    col1.metric("Total Orders", n_orders)
+    col2.metric("Total Signals", n_signals)
+    col3.metric("Signals Executed", n_executed)
+    col4.metric("Markets Tracked", n_markets)
+
+    if hourly:
+        hours, counts = zip(*hourly)
+        per_hour = pd.Series(counts, index=pd.to_datetime(hours)).asfreq("h", fill_value=0)
+        st.subheader("Orders per Hour")
+        st.bar_chart(per_hour)
 
 # --- Markets ---
 with tab_markets:
     st.subheader("Latest Market Snapshots")
     if markets:
-        df_m = pd.DataFrame([{
-            "Ticker": m.ticker,
-            "Title": m.title[:60],
-            "Last Price": m.last_price,
-            "Yes Bid": m.yes_bid,
-            "Yes Ask": m.yes_ask,
-            "Volume": m.volume,
-            "Fetched At": m.fetched_at,
-        } for m in markets[:100]])
+        df_m = pd.DataFrame.from_records(
+            [
+                (m.ticker, m.title[:60], m.last_price, m.yes_bid, m.yes_ask, m.volume, m.fetched_at)
+                for m in markets[:100]
+            ],
+            columns=["Ticker", "Title", "Last Price", "Yes Bid", "Yes Ask", "Volume", "Fetched At"],
+        )
         st.dataframe(df_m, use_container_width=True)
     else:
         st.info("No market data yet. Run the scanner to collect data.")
@@ -103,19 +116,28 @@ with tab_markets:
 with tab_orders:
     st.subheader("Order Log")
     if orders:
-        df_o = pd.DataFrame([{
-            "Time": o.created_at,
-            "Order ID": o.order_id[:12],
-            "Ticker": o.ticker,
-            "Action": o.action,
-            "Side": o.side,
-            "Type": o.order_type,
-            "Price": o.yes_price or o.no_price,
-            "Qty": o.count,
-            "Status": o.status,
-            "Strategy": o.strategy,
-            "Reason": o.reason[:50] if o.reason else "",
-        } for o in orders[:200]])
+        df_o = pd.DataFrame.from_records(
+            [
+                (
+                    o.created_at,
+                    o.order_id[:12],
+                    o.ticker,
+                    o.action,
+                    o.side,
+                    o.order_type,
+                    o.yes_price or o.no_price,
+                    o.count,
+                    o.status,
+                    o.strategy,
+                    o.reason[:50] if o.reason else "",
+                )
+                for o in orders[:200]
+            ],
+            columns=[
+                "Time", "Order ID", "Ticker", "Action", "Side", "Type",
+                "Price", "Qty", "Status", "Strategy", "Reason",
+            ],
+        )
         st.dataframe(df_o, use_container_width=True)
     else:
         st.info("No orders yet.")
@@ -124,17 +146,26 @@ with tab_orders:
 with tab_signals:
     st.subheader("Strategy Signals")
     if signals:
-        df_s = pd.DataFrame([{
-            "Time": s.created_at,
-            "Strategy": s.strategy,
-            "Ticker": s.ticker,
-            "Side": s.side,
-            "Price": s.price,
-            "Qty": s.quantity,
-            "Confidence": f"{s.confidence:.2f}",
-            "Executed": s.executed,
-            "Reason": s.reason[:60] if s.reason else "",
-        } for s in signals[:200]])
+        df_s = pd.DataFrame.from_records(
+            [
+                (
+                    s.created_at,
+                    s.strategy,
+                    s.ticker,
+                    s.side,
+                    s.price,
+                    s.quantity,
+                    f"{s.confidence:.2f}",
+                    s.executed,
+                    s.reason[:60] if s.reason else "",
+                )
+                for s in signals[:200]
+            ],
+            columns=[
+                "Time", "Strategy", "Ticker", "Side", "Price",
+                "Qty", "Confidence", "Executed", "Reason",
+            ],
+        )
         st.dataframe(df_s, use_container_width=True)
 
         strategy_counts = df_s["Strategy"].value_counts()
@@ -147,20 +178,19 @@ with tab_signals:
 # --- Prices ---
 with tab_prices:
     st.subheader("Price History")
-    prices = fetch_records(PriceRecord, limit=5000, order_col=PriceRecord.captured_at)
-    if prices:
-        tickers = sorted(set(p.ticker for p in prices))
+    store = get_store()
+    tickers = run_async(store.get_price_tickers())
+    if tickers:
         selected = st.selectbox("Select ticker", tickers)
-        filtered = [p for p in prices if p.ticker == selected]
-        if filtered:
-            df_p = pd.DataFrame([{
-                "Time": p.captured_at,
-                "Price": p.yes_price,
-                "Volume": p.volume,
-                "Source": p.source,
-            } for p in filtered])
-            df_p["Time"] = pd.to_datetime(df_p["Time"])
-            df_p = df_p.sort_values("Time")
+        # Averaged per minute in SQL, so the chart gets at most 500 points.
+        buckets = run_async(store.get_price_buckets(selected, bucket_seconds=60, limit=500))
+        if buckets:
+            starts, avg_prices, volumes = zip(*buckets)
+            df_p = pd.DataFrame({
+                "Time": pd.to_datetime(list(starts), unit="s", utc=True),
+                "Price": avg_prices,
+                "Volume": volumes,
+            })
 
             fig = go.Figure()
             fig.add_trace(go.Scatter(x=df_p["Time"], y=df_p["Price"], mode="lines+markers", name="Yes Price"))
@@ -0,0 +1,39 @@
+"""Columnar views over batches of markets, for vectorized strategy pre-checks."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import fields
+from typing import Any
+
+import numpy as np
+
+from pm_bot.data.models import MarketRow
+
+MARKET_FIELDS = tuple(f.name for f in fields(MarketRow))
+
+
+class MarketColumns(Mapping[str, np.ndarray]):
+    """Column view over a batch of markets; each column is built on first use.
+
+    Rows may be ``MarketRow``s, ``MarketRecord``s or live ``Market``s, which have
+    every ``MarketRow`` field except ``fetched_at``.
+    """
+
+    def __init__(self, rows: Sequence[Any]) -> None:
+        self._rows = rows
+        self._columns: dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            if name not in MARKET_FIELDS:
+                raise KeyError(name)
+            column = self._columns[name] = np.array([getattr(r, name) for r in self._rows])
+        return column
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(MARKET_FIELDS)
+
+    def __len__(self) -> int:
+        return len(MARKET_FIELDS)
@@ -0,0 +1,34 @@
+"""Binary encoding of orderbook levels for snapshot storage.
+
+Each side is stored as a packed array of ``(price, quantity)`` records, so reading
+it back is a single ``np.frombuffer`` instead of a JSON parse.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+from pm_bot.api.models import OrderBookLevel
+
+LEVEL_DTYPE = np.dtype([("price", "<i2"), ("quantity", "<i4")])
+
+
+@lru_cache(maxsize=128)
+def _packer(n: int) -> struct.Struct:
+    # Same unpadded little-endian layout as LEVEL_DTYPE, for n levels.
+    return struct.Struct("<" + "hi" * n)
+
+
+def encode_levels(levels: Sequence[OrderBookLevel]) -> bytes:
+    # Cheaper than np.array(levels, dtype=LEVEL_DTYPE) for books this short.
+    return _packer(len(levels)).pack(*chain.from_iterable(levels))
+
+
+def decode_levels(data: bytes) -> np.ndarray:
+    """Zero-copy structured view with ``price`` and ``quantity`` fields."""
+    return np.frombuffer(data, dtype=LEVEL_DTYPE)
@@ -2,17 +2,59 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
 
+from sqlalchemy import DateTime, Index
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from sqlmodel import Field, SQLModel
 
 
-def _utcnow() -> datetime:
-    return datetime.now(timezone.utc)
+class utcnow(FunctionElement):
+    """Current UTC time, evaluated by the database as a column default."""
+
+    # Matches the timezone-aware DateTime sqlmodel maps datetime fields to.
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element: utcnow, compiler: Any, **kw: Any) -> str:
+    # Standard SQL, but session-local time on some backends; those get their own below.
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element: utcnow, compiler: Any, **kw: Any) -> str:
+    # The timestamp columns are timestamptz here, which store an absolute instant
+    # whatever the session time zone. timezone('utc', now()) would be a naive value
+    # that the column then reads as session-local time.
+    return "now()"
+
+
+@compiles(utcnow, "mysql")
+@compiles(utcnow, "mariadb")
+def _utcnow_mysql(element: utcnow, compiler: Any, **kw: Any) -> str:
+    # Parenthesized, as MySQL requires for expression defaults.
+    return "(UTC_TIMESTAMP(6))"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element: utcnow, compiler: Any, **kw: Any) -> str:
+    # CURRENT_TIMESTAMP has whole-second resolution on SQLite; keep milliseconds.
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+def _db_timestamp() -> Any:
+    """Field stamped by the database on insert instead of by Python."""
+    return Field(default=None, sa_column_kwargs={"server_default": utcnow(), "nullable": False})
 
 
 class MarketRecord(SQLModel, table=True):
     __tablename__ = "markets"
+    __table_args__ = (Index("ix_markets_ticker_fetched", "ticker", "fetched_at"),)
 
     id: int | None = Field(default=None, primary_key=True)
     ticker: str = Field(index=True)
@@ -28,11 +70,39 @@ class MarketRecord(SQLModel, table=True):
     volume: int = 0
     open_interest: int = 0
     close_time: datetime | None = None
-    fetched_at: datetime = Field(default_factory=_utcnow)
+    fetched_at: datetime | None = _db_timestamp()
+
+
+@dataclass(slots=True, frozen=True)
+class MarketRow:
+    """Read-only copy of a ``MarketRecord`` row, without ORM or pydantic state.
+
+    Backtests stream these rather than hydrating thousands of ``MarketRecord``s.
+    """
+
+    ticker: str
+    title: str
+    status: str
+    event_ticker: str
+    category: str
+    yes_bid: int
+    yes_ask: int
+    no_bid: int
+    no_ask: int
+    last_price: int
+    volume: int
+    open_interest: int
+    close_time: datetime | None
+    fetched_at: datetime | None
+
+
+# MarketRecord columns in MarketRow field order, for selecting rows straight into it.
+MARKET_ROW_COLUMNS = tuple(getattr(MarketRecord, f.name) for f in fields(MarketRow))
 
 
 class OrderBookSnapshot(SQLModel, table=True):
     __tablename__ = "orderbook_snapshots"
+    __table_args__ = (Index("ix_orderbook_snapshots_ticker_captured", "ticker", "captured_at"),)
 
     id: int | None = Field(default=None, primary_key=True)
     ticker: str = Field(index=True)
@@ -40,9 +110,14 @@ class OrderBookSnapshot(SQLModel, table=True):
     best_yes_ask: int | None = None
     mid_price: float | None = None
     spread: int | None = None
+    # Legacy JSON levels, no longer written. init_db packs old rows into the binary
+    # columns once; DataStore.clear_level_json empties these afterwards.
     yes_levels_json: str = "[]"
     no_levels_json: str = "[]"
-    captured_at: datetime = Field(default_factory=_utcnow)
+    # Packed levels, see pm_bot.data.levels.
+    yes_levels_bin: bytes | None = None
+    no_levels_bin: bytes | None = None
+    captured_at: datetime | None = _db_timestamp()
 
 
 class TradeRecord(SQLModel, table=True):
@@ -59,18 +134,19 @@ class TradeRecord(SQLModel, table=True):
     order_id: str = ""
     client_order_id: str = ""
     created_time: datetime | None = None
-    recorded_at: datetime = Field(default_factory=_utcnow)
+    recorded_at: datetime | None = _db_timestamp()
 
 
 class PriceRecord(SQLModel, table=True):
     __tablename__ = "prices"
+    __table_args__ = (Index("ix_prices_ticker_captured", "ticker", "captured_at"),)
 
     id: int | None = Field(default=None, primary_key=True)
     ticker: str = Field(index=True)
     yes_price: int = 0
     volume: int = 0
     source: str = "ticker"
-    captured_at: datetime = Field(default_factory=_utcnow)
+    captured_at: datetime | None = _db_timestamp()
 
 
 class OrderRecord(SQLModel, table=True):
@@ -90,8 +166,8 @@ class OrderRecord(SQLModel, table=True):
     status: str = ""
     strategy: str = ""
     reason: str = ""
-    created_at: datetime = Field(default_factory=_utcnow)
-    updated_at: datetime = Field(default_factory=_utcnow)
+    created_at: datetime | None = _db_timestamp()
+    updated_at: datetime | None = _db_timestamp()
 
 
 class StrategySignalRecord(SQLModel, table=True):
@@ -106,4 +182,13 @@ class StrategySignalRecord(SQLModel, table=True):
     confidence: float = 0.0
     reason: str = ""
     executed: bool = False
-    created_at: datetime = Field(default_factory=_utcnow)
+    created_at: datetime | None = _db_timestamp()
+
+
+class SchemaMigration(SQLModel, table=True):
+    """A one-off data migration that init_db has already applied."""
+
+    __tablename__ = "schema_migrations"
+
+    name: str = Field(primary_key=True)
+    applied_at: datetime | None = _db_timestamp()
@@ -2,18 +2,47 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
+import struct
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any
 
+import orjson
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Integer,
+    Row,
+    String,
+    Table,
+    bindparam,
+    distinct,
+    event,
+    func,
+    insert,
+    inspect,
+    text,
+    update,
+)
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from pm_bot.api.models import Fill, Market, OrderBook
+from pm_bot.data.levels import encode_levels
 from pm_bot.data.models import (
+    MARKET_ROW_COLUMNS,
     MarketRecord,
+    MarketRow,
     OrderBookSnapshot,
     OrderRecord,
     PriceRecord,
+    SchemaMigration,
     StrategySignalRecord,
     TradeRecord,
 )
@@ -21,64 +50,376 @@ from pm_bot.utils.logging import get_logger
 
 log = get_logger("data.store")
 
+# Applied to every new SQLite connection. WAL lets readers run alongside the writer
+# and, with synchronous=NORMAL, commits no longer fsync the database file.
+SQLITE_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 268_435_456,
+    # Negative means KiB: a 64 MiB page cache per connection.
+    "cache_size": -65_536,
+}
+
+# Connection pool settings for server databases. SQLite keeps SQLAlchemy's default
+# pool for aiosqlite, where a connection is a local file handle.
+POOL_OPTIONS: dict[str, Any] = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_pre_ping": True,
+    "pool_use_lifo": True,
+    "pool_recycle": 1800,
+}
+
+# Rows queued by the save_*/log_* methods are written once this many are waiting,
+# or after this many seconds.
+WRITE_BATCH_ROWS = 500
+WRITE_BATCH_DELAY = 0.2
+
+
+class epoch_seconds(FunctionElement):
+    """Whole seconds since the Unix epoch of a UTC timestamp column."""
+
+    type = Integer()
+    inherit_cache = True
+
+
+class hour_label(FunctionElement):
+    """A UTC timestamp column truncated to its hour, as ``"YYYY-MM-DD HH:00"``."""
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(epoch_seconds)
+@compiles(hour_label)
+def _unsupported(element: FunctionElement, compiler: Any, **kw: Any) -> str:
+    raise CompileError(f"{type(element).__name__} is not supported on {compiler.dialect.name}")
+
+
+@compiles(epoch_seconds, "sqlite")
+def _epoch_seconds_sqlite(element: epoch_seconds, compiler: Any, **kw: Any) -> str:
+    return f"CAST(strftime('%s', {compiler.process(element.clauses, **kw)}) AS INTEGER)"
+
+
+@compiles(epoch_seconds, "postgresql")
+def _epoch_seconds_postgresql(element: epoch_seconds, compiler: Any, **kw: Any) -> str:
+    return f"CAST(floor(extract(epoch FROM {compiler.process(element.clauses, **kw)})) AS BIGINT)"
+
+
+@compiles(epoch_seconds, "mysql")
+@compiles(epoch_seconds, "mariadb")
+def _epoch_seconds_mysql(element: epoch_seconds, compiler: Any, **kw: Any) -> str:
+    # Not UNIX_TIMESTAMP, which reads DATETIME values in the session time zone.
+    return f"TIMESTAMPDIFF(SECOND, '1970-01-01', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(hour_label, "sqlite")
+def _hour_label_sqlite(element: hour_label, compiler: Any, **kw: Any) -> str:
+    return f"strftime('%Y-%m-%d %H:00', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(hour_label, "postgresql")
+def _hour_label_postgresql(element: hour_label, compiler: Any, **kw: Any) -> str:
+    column = compiler.process(element.clauses, **kw)
+    return f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:00')"
+
+
+@compiles(hour_label, "mysql")
+@compiles(hour_label, "mariadb")
+def _hour_label_mysql(element: hour_label, compiler: Any, **kw: Any) -> str:
+    fmt = "%Y-%m-%d %H:00"
+    if compiler.dialect.paramstyle in ("format", "pyformat"):
+        fmt = fmt.replace("%", "%%")
+    return f"DATE_FORMAT({compiler.process(element.clauses, **kw)}, '{fmt}')"
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """``create_all`` never alters existing tables; add columns introduced since."""
+    inspector = inspect(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                col_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+                log.info("column_added", table=table.name, column=column.name)
+
+
+def _rebuild_sqlite_table(conn: Connection, table: Table, columns: list[str]) -> None:
+    """Recreate ``table`` from its current definition, keeping the rows in ``columns``."""
+    old = f"{table.name}__old"
+    for index in inspect(conn).get_indexes(table.name):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old}"'))
+    table.create(conn)
+    names = ", ".join(f'"{name}"' for name in columns)
+    conn.execute(text(f'INSERT INTO "{table.name}" ({names}) SELECT {names} FROM "{old}"'))
+    conn.execute(text(f'DROP TABLE "{old}"'))
+
+
+# Tables whose rows rely on a server-side timestamp. Every other table's rows are
+# stamped in Python when they are queued, so a missing default there is harmless.
+_SERVER_STAMPED_TABLES = (MarketRecord.__table__,)
+
+
+def _add_missing_server_defaults(conn: Connection) -> None:
+    """Give existing columns the server defaults declared since they were created.
+
+    SQLite cannot change a column's default in place, so those tables are rebuilt.
+    Only ``_SERVER_STAMPED_TABLES`` are checked, so large tables that don't need it
+    (prices, snapshots) are never rebuilt.
+    """
+    inspector = inspect(conn)
+    for table in _SERVER_STAMPED_TABLES:
+        if not inspector.has_table(table.name):
+            continue
+        reflected = {c["name"]: c for c in inspector.get_columns(table.name)}
+        stale = [
+            column
+            for column in table.columns
+            if column.server_default is not None
+            and column.name in reflected
+            and reflected[column.name]["default"] is None
+        ]
+        if not stale:
+            continue
+        if conn.dialect.name == "sqlite":
+            kept = [c.name for c in table.columns if c.name in reflected]
+            _rebuild_sqlite_table(conn, table, kept)
+        else:
+            for column in stale:
+                default = column.server_default.arg.compile(dialect=conn.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+                        f"SET DEFAULT {default}"
+                    )
+                )
+        log.info("server_defaults_added", table=table.name, columns=[c.name for c in stale])
+
+
+def _add_missing_indexes(conn: Connection) -> None:
+    """Likewise for indexes declared after a table was first created."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _pack_json_levels(payload: str) -> bytes:
+    return encode_levels([(lv["price"], lv["quantity"]) for lv in orjson.loads(payload)])
+
+
+# Marks the JSON-to-binary snapshot levels backfill as done in schema_migrations.
+_LEVEL_BLOBS_MIGRATION = "snapshot_level_blobs"
+
+
+def _migration_applied(conn: Connection, name: str) -> bool:
+    return conn.execute(
+        select(SchemaMigration.name).where(SchemaMigration.name == name)
+    ).first() is not None
+
+
+def _backfill_level_blobs(conn: Connection, batch_size: int = 1000) -> None:
+    """Pack the JSON levels of snapshots written before the binary columns existed.
+
+    Runs once per database, recorded in ``schema_migrations``. Rows whose JSON
+    can't be read are logged and left unpacked; the JSON itself is kept until
+    ``DataStore.clear_level_json`` is run.
+    """
+    if _migration_applied(conn, _LEVEL_BLOBS_MIGRATION):
+        return
+    snap = OrderBookSnapshot
+    pending = (
+        select(snap.id, snap.yes_levels_json, snap.no_levels_json)
+        .where(snap.yes_levels_bin.is_(None), snap.id > bindparam("_after"))
+        .order_by(snap.id)
+        .limit(batch_size)
+    )
+    backfill = (
+        update(snap)
+        .where(snap.id == bindparam("_id"))
+        .values(yes_levels_bin=bindparam("_yes"), no_levels_bin=bindparam("_no"))
+    )
+    total = skipped = 0
+    after = 0
+    while rows := conn.execute(pending, {"_after": after}).all():
+        after = rows[-1].id
+        packed = []
+        for row_id, yes_json, no_json in rows:
+            try:
+                packed.append(
+                    {
+                        "_id": row_id,
+                        "_yes": _pack_json_levels(yes_json),
+                        "_no": _pack_json_levels(no_json),
+                    }
+                )
+            except (KeyError, TypeError, ValueError, struct.error) as e:
+                log.warning("snapshot_levels_unreadable", id=row_id, error=str(e))
+                skipped += 1
+        if packed:
+            conn.execute(backfill, packed)
+            total += len(packed)
+    conn.execute(insert(SchemaMigration).values(name=_LEVEL_BLOBS_MIGRATION))
+    if total or skipped:
+        log.info("snapshot_levels_backfilled", rows=total, skipped=skipped)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _market_row(m: Market) -> dict[str, Any]:
+    return {
+        "ticker": m.ticker,
+        "title": m.title,
+        "status": m.status,
+        "event_ticker": m.event_ticker,
+        "category": m.category,
+        "yes_bid": m.yes_bid,
+        "yes_ask": m.yes_ask,
+        "no_bid": m.no_bid,
+        "no_ask": m.no_ask,
+        "last_price": m.last_price,
+        "volume": m.volume,
+        "open_interest": m.open_interest,
+        "close_time": m.close_time,
+    }
+
+
+def trade_row(fill: Fill, client_order_id: str = "") -> dict[str, Any]:
+    """A ``TradeRecord`` insert row for ``DataStore.save_trades``."""
+    return {
+        "trade_id": fill.trade_id,
+        "ticker": fill.ticker,
+        "action": fill.action,
+        "side": fill.side,
+        "count": fill.count,
+        "yes_price": fill.yes_price,
+        "no_price": fill.no_price,
+        "order_id": fill.order_id,
+        "client_order_id": client_order_id,
+        "created_time": fill.created_time,
+    }
+
 
 class DataStore:
-    def __init__(self, db_url: str = "sqlite+aiosqlite:///pm_bot.db") -> None:
-        self._engine: AsyncEngine = create_async_engine(db_url, echo=False)
+    """Async access to the bot's database.
+
+    Prices, orderbook snapshots, trades, orders and signals are written behind: the
+    save/log methods queue rows, stamped with the time they were queued, and
+    ``flush`` inserts everything waiting in one transaction. Readers see those rows
+    once flushed; ``close`` flushes whatever is left.
+    """
+
+    def __init__(
+        self,
+        db_url: str = "sqlite+aiosqlite:///pm_bot.db",
+        pragmas: Mapping[str, str | int] | None = None,
+        batch_rows: int = WRITE_BATCH_ROWS,
+        batch_delay: float = WRITE_BATCH_DELAY,
+    ) -> None:
+        """``pragmas`` are merged over ``SQLITE_PRAGMAS``; ignored for other databases."""
+        is_sqlite = db_url.startswith("sqlite")
+        self._engine: AsyncEngine = create_async_engine(
+            db_url, echo=False, **({} if is_sqlite else POOL_OPTIONS)
+        )
+        if is_sqlite:
+            self._set_pragmas({**SQLITE_PRAGMAS, **(pragmas or {})})
+        self._sessionmaker = async_sessionmaker(
+            self._engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self._batch_rows = batch_rows
+        self._batch_delay = batch_delay
+        self._pending: dict[type[SQLModel], list[dict[str, Any]]] = {}
+        self._pending_rows = 0
+        self._flusher: asyncio.Task | None = None
+        # Serializes flushes, so close() waits for one already in progress.
+        self._flush_lock = asyncio.Lock()
+        self._stop_flusher = asyncio.Event()
+
+    def _set_pragmas(self, pragmas: Mapping[str, str | int]) -> None:
+        statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+        @event.listens_for(self._engine.sync_engine, "connect")
+        def _apply(dbapi_conn, _record) -> None:
+            cursor = dbapi_conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.close()
 
     async def init_db(self) -> None:
         async with self._engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.create_all)
+            await conn.run_sync(_add_missing_columns)
+            await conn.run_sync(_add_missing_server_defaults)
+            await conn.run_sync(_add_missing_indexes)
+            await conn.run_sync(_backfill_level_blobs)
         log.info("database_initialized")
 
-    async def _session(self) -> AsyncSession:
-        return AsyncSession(self._engine)
+    def session(self) -> AsyncSession:
+        """A new session on the store's shared engine and connection pool."""
+        return self._sessionmaker()
+
+    # --- Write-behind queue ---
+
+    async def _queue(self, model: type[SQLModel], rows: Sequence[dict[str, Any]]) -> None:
+        if self._flusher is None:
+            self._stop_flusher.clear()
+            self._flusher = asyncio.create_task(self._flush_periodically())
+        self._pending.setdefault(model, []).extend(rows)
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self._batch_rows:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Insert all queued rows, one executemany per table, in a single commit.
+
+        If the insert fails or is cancelled, the rows go back on the queue.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending, self._pending_rows = self._pending, {}, 0
+            try:
+                async with self.session() as session:
+                    for model, rows in pending.items():
+                        await session.exec(insert(model), params=rows)
+                    await session.commit()
+            except BaseException:
+                # Ahead of anything queued meanwhile, so rows keep their order.
+                for model, rows in pending.items():
+                    self._pending[model] = rows + self._pending.get(model, [])
+                    self._pending_rows += len(rows)
+                raise
+
+    async def _flush_periodically(self) -> None:
+        while not self._stop_flusher.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stop_flusher.wait(), self._batch_delay)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("write_flush_failed")
 
     # --- Markets ---
 
     async def save_market(self, market: Market) -> None:
-        async with AsyncSession(self._engine) as session:
-            record = MarketRecord(
-                ticker=market.ticker,
-                title=market.title,
-                status=market.status.value,
-                event_ticker=market.event_ticker,
-                category=market.category,
-                yes_bid=market.yes_bid,
-                yes_ask=market.yes_ask,
-                no_bid=market.no_bid,
-                no_ask=market.no_ask,
-                last_price=market.last_price,
-                volume=market.volume,
-                open_interest=market.open_interest,
-                close_time=market.close_time,
-            )
-            session.add(record)
-            await session.commit()
+        await self.save_markets([market])
 
-    async def save_markets(self, markets: list[Market]) -> None:
-        async with AsyncSession(self._engine) as session:
-            for m in markets:
-                record = MarketRecord(
-                    ticker=m.ticker,
-                    title=m.title,
-                    status=m.status.value,
-                    event_ticker=m.event_ticker,
-                    category=m.category,
-                    yes_bid=m.yes_bid,
-                    yes_ask=m.yes_ask,
-                    no_bid=m.no_bid,
-                    no_ask=m.no_ask,
-                    last_price=m.last_price,
-                    volume=m.volume,
-                    open_interest=m.open_interest,
-                    close_time=m.close_time,
-                )
-                session.add(record)
+    async def save_markets(self, markets: Sequence[Market]) -> None:
+        """Insert market snapshots in one statement and one commit."""
+        if not markets:
+            return
+        async with self.session() as session:
+            await session.exec(insert(MarketRecord), params=[_market_row(m) for m in markets])
             await session.commit()
 
     async def get_latest_markets(self, limit: int = 50) -> list[MarketRecord]:
-        async with AsyncSession(self._engine) as session:
+        async with self.session() as session:
             stmt = (
                 select(MarketRecord)
                 .order_by(MarketRecord.fetched_at.desc())
@@ -87,41 +428,122 @@ class DataStore:
             results = await session.exec(stmt)
             return list(results.all())
 
+    async def iter_market_records(
+        self,
+        *,
+        limit: int | None = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[MarketRow]:
+        """Stream market rows oldest first, the order a backtest replays them in.
+
+        With ``limit``, only the most recent ``limit`` records are streamed.
+        """
+        # Rows without a fetched_at count as the oldest, whatever the backend's
+        # default NULL ordering is.
+        fetched_at = MarketRecord.fetched_at
+        stmt = select(*MARKET_ROW_COLUMNS)
+        if limit is not None:
+            latest = (
+                select(MarketRecord.id)
+                .order_by(fetched_at.desc().nulls_last(), MarketRecord.id.desc())
+                .limit(limit)
+            )
+            stmt = stmt.where(MarketRecord.id.in_(latest))
+        stmt = stmt.order_by(fetched_at.asc().nulls_first(), MarketRecord.id).execution_options(
+            yield_per=chunk_size
+        )
+        async with self._engine.connect() as conn:
+            result = await conn.stream(stmt)
+            async for rows in result.partitions():
+                for row in rows:
+                    yield MarketRow(*row)
+
     # --- Orderbook ---
 
     async def save_orderbook(self, ticker: str, ob: OrderBook) -> None:
-        async with AsyncSession(self._engine) as session:
-            record = OrderBookSnapshot(
-                ticker=ticker,
-                best_yes_bid=ob.best_yes_bid,
-                best_yes_ask=ob.best_yes_ask,
-                mid_price=ob.mid_price,
-                spread=ob.spread,
-                yes_levels_json=json.dumps(
-                    [{"price": lv.price, "quantity": lv.quantity} for lv in ob.yes]
-                ),
-                no_levels_json=json.dumps(
-                    [{"price": lv.price, "quantity": lv.quantity} for lv in ob.no]
-                ),
+        row = {
+            "ticker": ticker,
+            "best_yes_bid": ob.best_yes_bid,
+            "best_yes_ask": ob.best_yes_ask,
+            "mid_price": ob.mid_price,
+            "spread": ob.spread,
+            "yes_levels_bin": encode_levels(ob.yes),
+            "no_levels_bin": encode_levels(ob.no),
+            "captured_at": _now(),
+        }
+        await self._queue(OrderBookSnapshot, [row])
+
+    async def iter_orderbook_snapshots(
+        self,
+        *,
+        limit: int = 10_000,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream raw snapshot rows in chunks without hydrating ORM objects.
+
+        Rows are ``(ticker, captured_at, yes_levels_bin, no_levels_bin)`` tuples.
+        """
+        stmt = (
+            select(
+                OrderBookSnapshot.ticker,
+                OrderBookSnapshot.captured_at,
+                OrderBookSnapshot.yes_levels_bin,
+                OrderBookSnapshot.no_levels_bin,
             )
-            session.add(record)
-            await session.commit()
+            .limit(limit)
+            .execution_options(yield_per=chunk_size)
+        )
+        async with self._engine.connect() as conn:
+            result = await conn.stream(stmt)
+            async for rows in result.partitions():
+                yield rows
 
-    # --- Prices ---
+    async def clear_level_json(self) -> int:
+        """Empty the legacy JSON levels of snapshots already packed into binary.
 
-    async def save_price(self, ticker: str, yes_price: int, volume: int = 0, source: str = "ticker") -> None:
-        async with AsyncSession(self._engine) as session:
-            record = PriceRecord(
-                ticker=ticker,
-                yes_price=yes_price,
-                volume=volume,
-                source=source,
+        Not part of ``init_db`` because it cannot be undone. Returns the rows cleared.
+        """
+        snap = OrderBookSnapshot
+        stmt = (
+            update(snap)
+            .where(
+                snap.yes_levels_bin.is_not(None),
+                (snap.yes_levels_json != "[]") | (snap.no_levels_json != "[]"),
             )
-            session.add(record)
-            await session.commit()
+            .values(yes_levels_json="[]", no_levels_json="[]")
+        )
+        async with self._engine.begin() as conn:
+            result = await conn.execute(stmt)
+        log.info("snapshot_level_json_cleared", rows=result.rowcount)
+        return result.rowcount
+
+    # --- Prices ---
+
+    async def save_price(
+        self, ticker: str, yes_price: int, volume: int = 0, source: str = "ticker"
+    ) -> None:
+        row = {
+            "ticker": ticker,
+            "yes_price": yes_price,
+            "volume": volume,
+            "source": source,
+            "captured_at": _now(),
+        }
+        await self._queue(PriceRecord, [row])
+
+    async def save_prices(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Queue many price rows; rows without ``captured_at`` get the current time."""
+        now = _now()
+        await self._queue(PriceRecord, [{"captured_at": now, **row} for row in rows])
 
     async def get_price_history(self, ticker: str, limit: int = 100) -> list[PriceRecord]:
-        async with AsyncSession(self._engine) as session:
+        """Latest ``limit`` prices for ``ticker``, newest first.
+
+        Served by ``ix_prices_ticker_captured``, scanned backwards. Prices still
+        queued by this store are flushed first, so they are included.
+        """
+        await self.flush()
+        async with self.session() as session:
             stmt = (
                 select(PriceRecord)
                 .where(PriceRecord.ticker == ticker)
@@ -131,24 +553,42 @@ class DataStore:
             results = await session.exec(stmt)
             return list(results.all())
 
+    async def get_price_buckets(
+        self, ticker: str, bucket_seconds: int = 60, limit: int = 500
+    ) -> list[tuple[int, float, int]]:
+        """Prices for ``ticker`` averaged per time bucket, oldest first.
+
+        Returns the latest ``limit`` buckets as ``(bucket_start, avg_yes_price,
+        total_volume)`` with ``bucket_start`` in epoch seconds. Supported on SQLite,
+        PostgreSQL and MySQL; other databases raise ``CompileError``.
+        """
+        async with self.session() as session:
+            epoch = epoch_seconds(PriceRecord.captured_at)
+            bucket = (epoch // bucket_seconds * bucket_seconds).label("bucket")
+            latest = (
+                select(bucket, func.avg(PriceRecord.yes_price), func.sum(PriceRecord.volume))
+                .where(PriceRecord.ticker == ticker)
+                .group_by(bucket)
+                .order_by(bucket.desc())
+                .limit(limit)
+            )
+            rows = (await session.exec(latest)).all()
+            return [(start, price, volume) for start, price, volume in reversed(rows)]
+
+    async def get_price_tickers(self) -> list[str]:
+        async with self.session() as session:
+            stmt = select(PriceRecord.ticker).distinct().order_by(PriceRecord.ticker)
+            return list((await session.exec(stmt)).all())
+
     # --- Trades ---
 
     async def save_trade(self, fill: Fill, client_order_id: str = "") -> None:
-        async with AsyncSession(self._engine) as session:
-            record = TradeRecord(
-                trade_id=fill.trade_id,
-                ticker=fill.ticker,
-                action=fill.action.value,
-                side=fill.side.value,
-                count=fill.count,
-                yes_price=fill.yes_price,
-                no_price=fill.no_price,
-                order_id=fill.order_id,
-                client_order_id=client_order_id,
-                created_time=fill.created_time,
-            )
-            session.add(record)
-            await session.commit()
+        await self.save_trades([trade_row(fill, client_order_id)])
+
+    async def save_trades(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Queue many trade rows (see ``trade_row``)."""
+        now = _now()
+        await self._queue(TradeRecord, [{"recorded_at": now, **row} for row in rows])
 
     # --- Order log ---
 
@@ -169,24 +609,25 @@ class DataStore:
         strategy: str = "",
         reason: str = "",
     ) -> None:
-        async with AsyncSession(self._engine) as session:
-            record = OrderRecord(
-                order_id=order_id,
-                client_order_id=client_order_id,
-                ticker=ticker,
-                action=action,
-                side=side,
-                order_type=order_type,
-                yes_price=yes_price,
-                no_price=no_price,
-                count=count,
-                remaining_count=remaining_count,
-                status=status,
-                strategy=strategy,
-                reason=reason,
-            )
-            session.add(record)
-            await session.commit()
+        now = _now()
+        row = {
+            "order_id": order_id,
+            "client_order_id": client_order_id,
+            "ticker": ticker,
+            "action": action,
+            "side": side,
+            "order_type": order_type,
+            "yes_price": yes_price,
+            "no_price": no_price,
+            "count": count,
+            "remaining_count": remaining_count,
+            "status": status,
+            "strategy": strategy,
+            "reason": reason,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await self._queue(OrderRecord, [row])
 
     # --- Strategy signals ---
 
@@ -202,19 +643,49 @@ class DataStore:
         reason: str,
         executed: bool = False,
     ) -> None:
-        async with AsyncSession(self._engine) as session:
-            record = StrategySignalRecord(
-                strategy=strategy,
-                ticker=ticker,
-                side=side,
-                price=price,
-                quantity=quantity,
-                confidence=confidence,
-                reason=reason,
-                executed=executed,
-            )
-            session.add(record)
-            await session.commit()
+        row = {
+            "strategy": strategy,
+            "ticker": ticker,
+            "side": side,
+            "price": price,
+            "quantity": quantity,
+            "confidence": confidence,
+            "reason": reason,
+            "executed": executed,
+        }
+        await self.log_signals([row])
+
+    async def log_signals(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Queue many ``StrategySignalRecord`` rows, keyed like ``log_signal``'s arguments."""
+        now = _now()
+        await self._queue(StrategySignalRecord, [{"created_at": now, **row} for row in rows])
+
+    # --- Aggregates ---
+
+    async def count(self, model: type[SQLModel], *where: ColumnElement[bool]) -> int:
+        async with self.session() as session:
+            stmt = select(func.count()).select_from(model).where(*where)
+            return (await session.exec(stmt)).one()
+
+    async def count_distinct(self, column: ColumnElement) -> int:
+        async with self.session() as session:
+            return (await session.exec(select(func.count(distinct(column))))).one()
+
+    async def count_by_hour(self, column: ColumnElement) -> list[tuple[str, int]]:
+        """Row counts per hour of ``column`` as ``("YYYY-MM-DD HH:00", n)``, oldest first.
+
+        Supported on SQLite, PostgreSQL and MySQL; other databases raise ``CompileError``.
+        """
+        async with self.session() as session:
+            hour = hour_label(column).label("hour")
+            stmt = select(hour, func.count()).group_by(hour).order_by(hour)
+            return [(h, n) for h, n in (await session.exec(stmt)).all()]
 
     async def close(self) -> None:
+        if self._flusher is not None:
+            # Let the flusher finish its current flush rather than cancelling it.
+            self._stop_flusher.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
         await self._engine.dispose()
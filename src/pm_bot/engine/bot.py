@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import signal
 import sys
 
@@ -121,9 +122,15 @@ class Bot:
             risk_manager=self._risk,
             store=store,
             strategies=self._strategies,
+            orderbook_concurrency=settings.orderbook_concurrency,
         )
         self._running = False
         self._shutdown_event = asyncio.Event()
+        # Set while run() is not executing; shutdown waits on it before closing the
+        # alert clients that run() sends through.
+        self._run_exited = asyncio.Event()
+        self._run_exited.set()
+        self._shutdown_task: asyncio.Task[None] | None = None
 
     def _install_signal_handlers(self) -> None:
         """Register OS signal handlers for graceful shutdown (Unix only)."""
@@ -133,8 +140,21 @@ class Bot:
                 loop.add_signal_handler(sig, lambda: asyncio.create_task(self.shutdown()))
         # On Windows, KeyboardInterrupt (Ctrl+C) is handled in the CLI runner.
 
+    async def _pause(self, seconds: float) -> None:
+        """Sleep, but wake as soon as shutdown starts."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._shutdown_event.wait(), seconds)
+
     async def run(self) -> None:
         self._running = True
+        self._shutdown_event.clear()
+        self._run_exited.clear()
+        try:
+            await self._run()
+        finally:
+            self._run_exited.set()
+
+    async def _run(self) -> None:
         self._install_signal_handlers()
 
         log.info(
@@ -164,11 +184,15 @@ class Bot:
                     )
                     cancelled = await self._order_manager.cancel_all()
                     log.info("emergency_cancel", orders_cancelled=cancelled)
-                    await asyncio.sleep(60)
+                    await self._pause(60)
                     continue
 
-                markets = await self._scanner.scan_once()
-                await self._portfolio.sync()
+                # Scanning and the portfolio sync are independent requests; both have to
+                # finish before risk checks run in evaluate_markets, which then pipelines
+                # orderbook fetches against strategy evaluation.
+                markets, _ = await asyncio.gather(
+                    self._scanner.scan_once(), self._portfolio.sync()
+                )
                 signals = await self._engine.evaluate_markets(markets)
 
                 log.info(
@@ -182,13 +206,26 @@ class Bot:
                 log.exception("bot_cycle_error")
                 await self._alerts.warning("Bot cycle error -- check logs.")
 
-            await asyncio.sleep(self._settings.scanner_poll_interval_seconds)
+            await self._pause(self._settings.scanner_poll_interval_seconds)
 
     async def shutdown(self) -> None:
-        if not self._running:
-            return
+        """Stop the bot, cancel its resting orders and close the alert clients.
+
+        Safe to call again, e.g. from the CLI after a signal already started it: later
+        calls wait for the first shutdown to finish instead of returning early.
+        """
+        if self._shutdown_task is None:
+            if not self._running:
+                return
+            self._shutdown_task = asyncio.create_task(self._shutdown())
+        # Shielded so a cancelled caller (the signal handler's task) doesn't abandon
+        # the order cancellation for everyone else.
+        await asyncio.shield(self._shutdown_task)
+
+    async def _shutdown(self) -> None:
         self._running = False
         self._scanner.stop()
+        self._shutdown_event.set()
         log.info("bot_shutting_down")
 
         cancelled = await self._order_manager.cancel_all()
@@ -196,4 +233,7 @@ class Bot:
         await self._alerts.warning(
             f"Bot shut down. Cancelled {cancelled} open orders."
         )
-        self._shutdown_event.set()
+        # A signal-triggered shutdown runs beside run(), which may be mid-cycle and
+        # still alerting; close the clients only once it has returned.
+        await self._run_exited.wait()
+        await self._alerts.aclose()
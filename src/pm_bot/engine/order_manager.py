@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import uuid
+import asyncio
 from typing import Any
 
 from pm_bot.api.client import KalshiClient
@@ -18,6 +18,9 @@ from pm_bot.utils.logging import get_logger
 
 log = get_logger("engine.order_manager")
 
+# Cancels cancel_all keeps in flight; the client's rate limiter still paces them.
+CANCEL_CONCURRENCY = 32
+
 
 class OrderManager:
     """Manages order placement, cancellation, and lifecycle tracking."""
@@ -44,7 +47,6 @@ class OrderManager:
         strategy: str = "",
         reason: str = "",
     ) -> Order | None:
-        client_order_id = str(uuid.uuid4())
         req = OrderRequest(
             ticker=ticker,
             action=action,
@@ -53,7 +55,6 @@ class OrderManager:
             type=order_type,
             yes_price=yes_price,
             no_price=no_price,
-            client_order_id=client_order_id,
         )
         try:
             resp = await self._client.create_order(req)
@@ -62,7 +63,7 @@ class OrderManager:
 
             await self._store.log_order(
                 order_id=order.order_id,
-                client_order_id=client_order_id,
+                client_order_id=str(req.client_order_id),
                 ticker=ticker,
                 action=action.value,
                 side=side.value,
@@ -71,7 +72,7 @@ class OrderManager:
                 no_price=no_price or 0,
                 count=count,
                 remaining_count=order.remaining_count,
-                status=order.status.value,
+                status=order.status,
                 strategy=strategy,
                 reason=reason,
             )
@@ -111,11 +112,16 @@ class OrderManager:
             return False
 
     async def cancel_all(self, ticker: str = "") -> int:
-        cancelled = 0
         orders_resp = await self._client.get_orders(status="resting", ticker=ticker)
-        for order in orders_resp.orders:
-            if await self.cancel_order(order.order_id):
-                cancelled += 1
+        limit = asyncio.Semaphore(CANCEL_CONCURRENCY)
+
+        async def cancel(order_id: str) -> bool:
+            async with limit:
+                return await self.cancel_order(order_id)
+
+        # cancel_order logs and swallows its own failures, so nothing here raises.
+        results = await asyncio.gather(*(cancel(o.order_id) for o in orders_resp.orders))
+        cancelled = sum(results)
         log.info("cancel_all_complete", ticker=ticker or "all", cancelled=cancelled)
         return cancelled
 
@@ -127,5 +133,6 @@ class OrderManager:
 
     async def get_fills_for_order(self, order_id: str) -> list[dict[str, Any]]:
         """Get fill records for a specific order (for reconciliation)."""
-        resp = await self._client.get_fills()
+        # Filtered by the API, so only this order's fills are sent and validated.
+        resp = await self._client.get_fills(order_id=order_id)
         return [f.model_dump() for f in resp.fills if f.order_id == order_id]
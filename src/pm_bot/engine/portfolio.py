@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
 from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
 
 from pm_bot.api.client import KalshiClient
 from pm_bot.api.models import Position
@@ -13,34 +18,84 @@ log = get_logger("engine.portfolio")
 CENTICENTS_PER_DOLLAR = 10_000
 
 
+@dataclass(slots=True, frozen=True)
+class PositionArray:
+    """Positions as parallel columns, one row per position."""
+
+    tickers: np.ndarray
+    sides: np.ndarray
+    quantity: np.ndarray
+    position_cost: np.ndarray
+    realized_pnl: np.ndarray
+    fees_paid: np.ndarray
+    # Row of each ticker; a duplicate ticker resolves to its first row.
+    rows: dict[str, int]
+
+    @classmethod
+    def from_list(cls, positions: Sequence[Position]) -> PositionArray:
+        table = np.array(
+            [(p.quantity, p.position_cost, p.realized_pnl, p.fees_paid) for p in positions],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        quantity, position_cost, realized_pnl, fees_paid = table.T
+        tickers = [p.market_ticker for p in positions]
+        return cls(
+            tickers=np.array(tickers, dtype=object),
+            sides=np.array([p.side for p in positions], dtype=object),
+            quantity=quantity,
+            position_cost=position_cost,
+            realized_pnl=realized_pnl,
+            fees_paid=fees_paid,
+            rows={t: i for i, t in reversed(list(enumerate(tickers)))},
+        )
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def position(self, row: int) -> Position:
+        return Position(
+            market_ticker=self.tickers[row],
+            side=self.sides[row],
+            quantity=int(self.quantity[row]),
+            position_cost=int(self.position_cost[row]),
+            realized_pnl=int(self.realized_pnl[row]),
+            fees_paid=int(self.fees_paid[row]),
+        )
+
+    def to_list(self) -> list[Position]:
+        return [self.position(row) for row in range(len(self))]
+
+
 @dataclass
 class PortfolioSnapshot:
     balance_cents: int = 0
-    positions: list[Position] = field(default_factory=list)
+    positions: PositionArray = field(default_factory=lambda: PositionArray.from_list([]))
 
     @property
     def balance_dollars(self) -> float:
         return self.balance_cents / 100
 
-    @property
+    # Snapshots are replaced, never mutated, so each total is computed once and then
+    # read as a plain attribute by every risk check until the next sync.
+    @cached_property
     def total_cost_dollars(self) -> float:
-        return sum(p.position_cost for p in self.positions) / CENTICENTS_PER_DOLLAR
+        return int(self.positions.position_cost.sum()) / CENTICENTS_PER_DOLLAR
 
-    @property
+    @cached_property
     def total_realized_pnl_dollars(self) -> float:
-        return sum(p.realized_pnl for p in self.positions) / CENTICENTS_PER_DOLLAR
+        return int(self.positions.realized_pnl.sum()) / CENTICENTS_PER_DOLLAR
 
-    @property
+    @cached_property
     def total_fees_dollars(self) -> float:
-        return sum(p.fees_paid for p in self.positions) / CENTICENTS_PER_DOLLAR
+        return int(self.positions.fees_paid.sum()) / CENTICENTS_PER_DOLLAR
 
-    @property
+    @cached_property
     def total_quantity(self) -> int:
-        return sum(abs(p.quantity) for p in self.positions)
+        return int(np.abs(self.positions.quantity).sum())
 
-    @property
+    @cached_property
     def num_positions(self) -> int:
-        return len([p for p in self.positions if p.quantity != 0])
+        return int(np.count_nonzero(self.positions.quantity))
 
 
 class PortfolioTracker:
@@ -56,12 +111,13 @@ class PortfolioTracker:
         return self._snapshot
 
     async def sync(self) -> PortfolioSnapshot:
-        bal = await self._client.get_balance()
-        pos_resp = await self._client.get_positions()
+        bal, pos_resp = await asyncio.gather(
+            self._client.get_balance(), self._client.get_positions()
+        )
 
         self._snapshot = PortfolioSnapshot(
             balance_cents=bal.balance,
-            positions=pos_resp.market_positions,
+            positions=PositionArray.from_list(pos_resp.market_positions),
         )
 
         if self._daily_pnl_start is None:
@@ -86,11 +142,10 @@ class PortfolioTracker:
         self._daily_pnl_start = self._snapshot.total_realized_pnl_dollars
 
     def get_position(self, ticker: str) -> Position | None:
-        for p in self._snapshot.positions:
-            if p.market_ticker == ticker:
-                return p
-        return None
+        row = self._snapshot.positions.rows.get(ticker)
+        return None if row is None else self._snapshot.positions.position(row)
 
     def position_quantity(self, ticker: str) -> int:
-        p = self.get_position(ticker)
-        return p.quantity if p else 0
+        positions = self._snapshot.positions
+        row = positions.rows.get(ticker)
+        return 0 if row is None else int(positions.quantity[row])
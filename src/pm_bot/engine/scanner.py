@@ -13,18 +13,45 @@ from pm_bot.utils.logging import get_logger
 log = get_logger("engine.scanner")
 
 MarketFilter = Callable[[Market], bool]
+# Markets per page; the API's maximum, so a scan takes as few round trips as possible.
+SCAN_PAGE_SIZE = 1000
+# ticker, category, volume, yes_bid and yes_ask. When every filter is declared with
+# keyed_filter, a market whose key is unchanged since the previous scan reuses that
+# scan's verdict instead of running the filters again.
+FilterKey = tuple[str, str, int, int, int]
+
+
+def _filter_key(m: Market) -> FilterKey:
+    return (m.ticker, m.category, m.volume, m.yes_bid, m.yes_ask)
+
+
+def keyed_filter(f: MarketFilter) -> MarketFilter:
+    """Declare that ``f`` reads only the ``FilterKey`` fields of a market.
+
+    Its verdicts are then cached between scans. A filter reading any other field
+    must not be declared, or it will see stale verdicts.
+    """
+    f.reads_filter_key = True  # type: ignore[attr-defined]
+    return f
+
+
+def _caches_verdicts(filters: list[MarketFilter]) -> bool:
+    return all(getattr(f, "reads_filter_key", False) for f in filters)
 
 
 def min_volume_filter(min_vol: int) -> MarketFilter:
+    @keyed_filter
     def _filter(m: Market) -> bool:
         return m.volume >= min_vol
     return _filter
 
 
+@keyed_filter
 def has_liquidity_filter(m: Market) -> bool:
     return m.yes_bid > 0 and m.yes_ask > 0
 
 
+@keyed_filter
 def weather_category_filter(m: Market) -> bool:
     """Keep only markets in weather/climate categories or with weather tickers."""
     if m.category.lower() in ("weather", "climate"):
@@ -53,33 +80,58 @@ class MarketScanner:
         self._filters = filters or []
         self._running = False
         self._markets: dict[str, Market] = {}
+        self._cache_verdicts = _caches_verdicts(self._filters)
+        self._verdicts: dict[FilterKey, bool] = {}
 
     @property
     def markets(self) -> dict[str, Market]:
         return dict(self._markets)
 
     def add_filter(self, f: MarketFilter) -> None:
+        """Add a filter. Unless it is a ``keyed_filter``, verdicts stop being cached."""
         self._filters.append(f)
+        self._cache_verdicts = _caches_verdicts(self._filters)
+        self._verdicts.clear()
 
     async def scan_once(self) -> list[Market]:
-        all_markets: list[Market] = []
-        cursor = ""
-        while True:
-            resp: MarketsResponse = await self._client.get_markets(
-                limit=100, cursor=cursor, status="open"
+        # Each page's cursor comes from the previous response, so pages can't be
+        # fetched in parallel; instead the next page is requested before the current
+        # one is filtered, and pages are as large as the API allows.
+        def fetch(cursor: str) -> asyncio.Task[MarketsResponse]:
+            return asyncio.create_task(
+                self._client.get_markets(limit=SCAN_PAGE_SIZE, cursor=cursor, status="open")
             )
-            all_markets.extend(resp.markets)
-            if not resp.cursor:
-                break
-            cursor = resp.cursor
 
-        filtered = all_markets
-        for f in self._filters:
-            filtered = [m for m in filtered if f(m)]
+        # Only keys seen in this scan are kept, so markets that closed drop out.
+        previous, verdicts = self._verdicts, {}
+        filtered: list[Market] = []
+        total = 0
+        page: asyncio.Task[MarketsResponse] | None = fetch("")
+        try:
+            while page is not None:
+                resp = await page
+                page = None
+                if resp.cursor:
+                    page = fetch(resp.cursor)
+                    await asyncio.sleep(0)  # let the request go out before filtering
+                total += len(resp.markets)
+                for m in resp.markets:
+                    key = _filter_key(m)
+                    keep = previous.get(key)
+                    if keep is None:
+                        keep = all(f(m) for f in self._filters)
+                    if self._cache_verdicts:
+                        verdicts[key] = keep
+                    if keep:
+                        filtered.append(m)
+        finally:
+            if page is not None:
+                page.cancel()
+        self._verdicts = verdicts
 
         self._markets = {m.ticker: m for m in filtered}
         await self._store.save_markets(filtered)
-        log.info("scan_complete", total=len(all_markets), filtered=len(filtered))
+        log.info("scan_complete", total=total, filtered=len(filtered))
         return filtered
 
     async def run(self) -> None:
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
 import httpx
+import numpy as np
 
 from pm_bot.api.client import KalshiClient
-from pm_bot.api.models import Market, OrderType
+from pm_bot.api.models import Market, OrderBook, OrderBookLevel, OrderType
+from pm_bot.data.columns import MarketColumns
 from pm_bot.data.store import DataStore
 from pm_bot.engine.order_manager import OrderManager
 from pm_bot.engine.risk import RiskManager
@@ -14,6 +21,25 @@ from pm_bot.utils.logging import get_logger
 
 log = get_logger("engine.strategy_engine")
 
+# Stays within the client's rate-limiter burst.
+ORDERBOOK_CONCURRENCY = 8
+# An unchanged orderbook is saved again after this many seconds, so quiet markets
+# still show up in the snapshot history.
+ORDERBOOK_RESAVE_SECONDS = 60.0
+
+
+def _signal_row(signal: Signal, executed: bool) -> dict[str, Any]:
+    return {
+        "strategy": signal.strategy_name,
+        "ticker": signal.market_ticker,
+        "side": signal.side.value,
+        "price": signal.price,
+        "quantity": signal.quantity,
+        "confidence": signal.confidence,
+        "reason": signal.reason,
+        "executed": executed,
+    }
+
 
 class StrategyEngine:
     """Feeds market data to strategies, filters signals through risk, and executes orders."""
@@ -25,19 +51,64 @@ class StrategyEngine:
         risk_manager: RiskManager,
         store: DataStore,
         strategies: list[Strategy],
+        orderbook_concurrency: int = ORDERBOOK_CONCURRENCY,
     ) -> None:
         self._client = client
         self._order_manager = order_manager
         self._risk = risk_manager
         self._store = store
         self._strategies = strategies
+        self._orderbook_concurrency = max(orderbook_concurrency, 1)
+        # Levels of the last orderbook saved per ticker, and when it was saved.
+        self._saved_books: dict[
+            str, tuple[tuple[OrderBookLevel, ...], tuple[OrderBookLevel, ...], float]
+        ] = {}
 
     async def evaluate_market(self, market: Market) -> list[Signal]:
         """Run all applicable strategies on a single market and execute approved signals."""
         # Skip markets no strategy wants to trade (saves API calls, avoids 404s)
-        if not any(s.should_trade(market) for s in self._strategies):
+        strategies = self._applicable(market)
+        if not strategies:
             return []
 
+        orderbook = await self._fetch_orderbook(market)
+        if orderbook is None:
+            return []
+        return await self._evaluate(market, orderbook, strategies)
+
+    def _applicable(self, market: Market) -> list[Strategy]:
+        return [
+            s for s in self._strategies if s.watches(market.ticker) and s.should_trade(market)
+        ]
+
+    def _applicability(self, markets: list[Market]) -> np.ndarray:
+        """Boolean (strategy, market) matrix of which strategy evaluates which market.
+
+        Each strategy's ``record_mask`` rules out whole columns of markets at once;
+        ``watches`` and ``should_trade`` only run for the markets it lets through.
+        """
+        columns = MarketColumns(markets)
+        applies = np.zeros((len(self._strategies), len(markets)), dtype=bool)
+        for k, strategy in enumerate(self._strategies):
+            mask = strategy.record_mask(columns)
+            rows = range(len(markets)) if mask is None else np.flatnonzero(mask).tolist()
+            for i in rows:
+                market = markets[i]
+                applies[k, i] = strategy.watches(market.ticker) and strategy.should_trade(market)
+        return applies
+
+    def _book_changed(self, ticker: str, orderbook: OrderBook) -> bool:
+        """Whether the book differs from the last one saved for this ticker (or is due anyway)."""
+        yes, no, now = tuple(orderbook.yes), tuple(orderbook.no), time.monotonic()
+        saved = self._saved_books.get(ticker)
+        if saved is not None:
+            saved_yes, saved_no, saved_at = saved
+            if (yes, no) == (saved_yes, saved_no) and now - saved_at < ORDERBOOK_RESAVE_SECONDS:
+                return False
+        self._saved_books[ticker] = (yes, no, now)
+        return True
+
+    async def _fetch_orderbook(self, market: Market) -> OrderBook | None:
         try:
             ob_resp = await self._client.get_orderbook(market.ticker)
         except httpx.HTTPStatusError as e:
@@ -45,48 +116,46 @@ class StrategyEngine:
                 log.debug("orderbook_not_available", ticker=market.ticker)
             else:
                 log.warning("orderbook_fetch_failed", ticker=market.ticker, status=e.response.status_code)
-            return []
+            return None
         except Exception:
             log.exception("orderbook_fetch_failed", ticker=market.ticker)
-            return []
+            return None
+        return ob_resp.orderbook
 
-        orderbook = ob_resp.orderbook
-        await self._store.save_orderbook(market.ticker, orderbook)
+    async def _evaluate(
+        self, market: Market, orderbook: OrderBook, strategies: list[Strategy]
+    ) -> list[Signal]:
+        if self._book_changed(market.ticker, orderbook):
+            await self._store.save_orderbook(market.ticker, orderbook)
 
         all_signals: list[Signal] = []
 
-        for strategy in self._strategies:
-            if not strategy.should_trade(market):
-                continue
+        for strategy in strategies:
             try:
                 signals = await strategy.on_market_update(market, orderbook)
                 all_signals.extend(signals)
             except Exception:
                 log.exception("strategy_error", strategy=strategy.name, ticker=market.ticker)
 
-        for signal in all_signals:
-            await self._process_signal(signal)
+        # Risk checks read the last synced portfolio, which placing orders doesn't
+        # change, so every signal is vetted first, the market's signals are logged
+        # in one batch and the approved orders go out together.
+        verdicts = [self._vet_signal(signal) for signal in all_signals]
+        if all_signals:
+            await self._store.log_signals(
+                [_signal_row(signal, allowed) for signal, allowed in zip(all_signals, verdicts)]
+            )
+        approved = [signal for signal, allowed in zip(all_signals, verdicts) if allowed]
+        await asyncio.gather(*(self._place_order(signal) for signal in approved))
 
         return all_signals
 
-    async def _process_signal(self, signal: Signal) -> None:
+    def _vet_signal(self, signal: Signal) -> bool:
         allowed, reason = self._risk.validate_order(
             ticker=signal.market_ticker,
             quantity=signal.quantity,
             action=signal.action.value,
         )
-
-        await self._store.log_signal(
-            strategy=signal.strategy_name,
-            ticker=signal.market_ticker,
-            side=signal.side.value,
-            price=signal.price,
-            quantity=signal.quantity,
-            confidence=signal.confidence,
-            reason=signal.reason,
-            executed=allowed,
-        )
-
         if not allowed:
             log.info(
                 "signal_rejected",
@@ -94,8 +163,9 @@ class StrategyEngine:
                 strategy=signal.strategy_name,
                 risk_reason=reason,
             )
-            return
+        return allowed
 
+    async def _place_order(self, signal: Signal) -> None:
         await self._order_manager.place_order(
             ticker=signal.market_ticker,
             action=signal.action,
@@ -109,8 +179,42 @@ class StrategyEngine:
         )
 
     async def evaluate_markets(self, markets: list[Market]) -> list[Signal]:
+        # Strategies are picked once for the whole batch, before any orderbook is fetched.
+        applies = self._applicability(markets)
+        candidates = [
+            (markets[i], [self._strategies[k] for k in np.flatnonzero(applies[:, i]).tolist()])
+            for i in np.flatnonzero(applies.any(axis=0)).tolist()
+        ]
+
+        # Keep a sliding window of orderbook fetches in flight (multiplexed over the
+        # client's HTTP/2 connection) and evaluate markets in order as their books
+        # arrive, so risk checks and order placement never interleave. A slow fetch
+        # no longer holds up a whole batch, and books are never fetched more than
+        # the window ahead of their evaluation.
+        remaining = iter(candidates)
+        window: deque[tuple[Market, list[Strategy], asyncio.Task[OrderBook | None]]] = deque()
+
+        def fetch_next() -> None:
+            candidate = next(remaining, None)
+            if candidate is not None:
+                market, strategies = candidate
+                fetch = asyncio.create_task(self._fetch_orderbook(market))
+                window.append((market, strategies, fetch))
+
+        for _ in range(self._orderbook_concurrency):
+            fetch_next()
+
         all_signals: list[Signal] = []
-        for market in markets:
-            signals = await self.evaluate_market(market)
-            all_signals.extend(signals)
+        try:
+            while window:
+                market, strategies, fetch = window.popleft()
+                orderbook = await fetch
+                fetch_next()
+                if orderbook is None:
+                    continue
+                signals = await self._evaluate(market, orderbook, strategies)
+                all_signals.extend(signals)
+        finally:
+            for _, _, fetch in window:
+                fetch.cancel()
         return all_signals
@@ -0,0 +1,52 @@
+"""Shared API client and data store for CLI commands and scripts."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from pm_bot.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    from pm_bot.api.client import KalshiClient
+    from pm_bot.data.store import DataStore
+
+
+class AppContext:
+    """Builds the client and store on first use and closes whichever were built.
+
+    Everything run inside one ``app_context`` shares a single HTTP connection pool
+    and a single database engine.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+
+    @cached_property
+    def client(self) -> KalshiClient:
+        from pm_bot.api.client import KalshiClient
+
+        return KalshiClient(self.settings)
+
+    @cached_property
+    def store(self) -> DataStore:
+        from pm_bot.data.store import DataStore
+
+        return DataStore(self.settings.db_url, self.settings.db_pragmas)
+
+    async def aclose(self) -> None:
+        if "client" in self.__dict__:
+            await self.client.close()
+        if "store" in self.__dict__:
+            await self.store.close()
+
+
+@asynccontextmanager
+async def app_context(settings: Settings | None = None) -> AsyncIterator[AppContext]:
+    ctx = AppContext(settings or get_settings())
+    try:
+        yield ctx
+    finally:
+        await ctx.aclose()
@@ -9,17 +9,31 @@ from __future__ import annotations
 
 import re
 from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 
 from pm_bot.api.models import Action, Market, OrderBook, Side
 from pm_bot.strategies.base import Signal, Strategy
 from pm_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from pm_bot.data.models import MarketRow
+
 log = get_logger("strategies.arbitrage")
 
+_THRESHOLD_RE = re.compile(r"(above|below|over|under|>=?|<=?)\s*([\d.]+)", re.IGNORECASE)
+
 
+# Titles don't change, and register_markets parses every title again on each call.
+@lru_cache(maxsize=4096)
 def _extract_threshold(title: str) -> float | None:
     """Try to extract a numeric threshold from a market title like 'GDP growth above 3.0%'."""
-    match = re.search(r"(above|below|over|under|>=?|<=?)\s*([\d.]+)", title, re.IGNORECASE)
+    match = _THRESHOLD_RE.search(title)
     if match:
         try:
             return float(match.group(2))
@@ -28,6 +42,33 @@ def _extract_threshold(title: str) -> float | None:
     return None
 
 
+def _last_prices(markets: list[Market]) -> np.ndarray:
+    return np.fromiter((m.last_price for m in markets), dtype=np.int16, count=len(markets))
+
+
+@dataclass(slots=True, frozen=True)
+class _EventMarkets:
+    """One event's registered markets, laid out for the checks to scan as arrays."""
+
+    markets: list[Market]
+    # Last price of each market above.
+    prices: np.ndarray
+    # Priced markets with a parseable threshold, in ascending threshold order.
+    by_threshold: list[Market]
+    threshold_prices: np.ndarray
+
+    @classmethod
+    def build(cls, markets: list[Market]) -> _EventMarkets:
+        priced = [
+            (thresh, m)
+            for m in markets
+            if m.last_price > 0 and (thresh := _extract_threshold(m.title)) is not None
+        ]
+        priced.sort(key=lambda x: x[0])
+        by_threshold = [m for _, m in priced]
+        return cls(markets, _last_prices(markets), by_threshold, _last_prices(by_threshold))
+
+
 class CrossMarketArbStrategy(Strategy):
     """Detect and exploit price inconsistencies across related markets."""
 
@@ -38,20 +79,39 @@ class CrossMarketArbStrategy(Strategy):
         *,
         min_edge_cents: int = 3,
         quantity: int = 1,
+        min_confidence: float = 0.0,
     ) -> None:
         self._min_edge = min_edge_cents
         self._quantity = quantity
-        self._event_markets: dict[str, list[Market]] = defaultdict(list)
+        # Opportunities scoring below this are skipped before any Signal is built.
+        self._min_confidence = min_confidence
+        self._events: dict[str, _EventMarkets] = {}
+
+    @staticmethod
+    def _eligible(event_ticker: Any) -> Any:
+        """The market pre-check, on a scalar or on a column array."""
+        return event_ticker != ""
 
     def should_trade(self, market: Market) -> bool:
-        return bool(market.event_ticker)
+        return bool(self._eligible(market.event_ticker))
+
+    def should_trade_record(self, record: MarketRow) -> bool:
+        return bool(self._eligible(record.event_ticker))
+
+    def record_mask(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return self._eligible(columns["event_ticker"])
 
     def register_markets(self, markets: list[Market]) -> None:
-        """Group markets by their parent event for cross-comparison."""
-        self._event_markets.clear()
+        """Group markets by their parent event for cross-comparison.
+
+        Thresholds are parsed and sorted, and prices gathered into arrays, here rather than on
+        every update: the markets (and their prices) only change on registration.
+        """
+        grouped: dict[str, list[Market]] = defaultdict(list)
         for m in markets:
             if m.event_ticker:
-                self._event_markets[m.event_ticker].append(m)
+                grouped[m.event_ticker].append(m)
+        self._events = {event: _EventMarkets.build(group) for event, group in grouped.items()}
 
     async def on_market_update(
         self,
@@ -60,63 +120,61 @@ class CrossMarketArbStrategy(Strategy):
     ) -> list[Signal]:
         signals: list[Signal] = []
 
-        event_ticker = market.event_ticker
-        related = self._event_markets.get(event_ticker, [])
-        if len(related) < 2:
+        event = self._events.get(market.event_ticker)
+        if event is None or len(event.markets) < 2:
             return []
 
-        signals.extend(self._check_monotonicity(related))
-        signals.extend(self._check_overround(related))
+        signals.extend(self._check_monotonicity(event.by_threshold, event.threshold_prices))
+        signals.extend(self._check_overround(event.markets, event.prices))
 
         return signals
 
-    def _check_monotonicity(self, markets: list[Market]) -> list[Signal]:
-        """If thresholds are ordered, prices should be monotonically decreasing."""
-        priced = []
-        for m in markets:
-            thresh = _extract_threshold(m.title)
-            if thresh is not None and m.last_price > 0:
-                priced.append((thresh, m))
+    def _check_monotonicity(self, markets: list[Market], prices: np.ndarray) -> list[Signal]:
+        """If thresholds are ordered, prices should be monotonically decreasing.
 
-        priced.sort(key=lambda x: x[0])
+        ``markets`` are in ascending threshold order and ``prices`` are their last prices.
+        """
         signals: list[Signal] = []
 
-        for i in range(len(priced) - 1):
-            lower_thresh, lower_m = priced[i]
-            upper_thresh, upper_m = priced[i + 1]
-
-            if upper_m.last_price > lower_m.last_price + self._min_edge:
-                edge = upper_m.last_price - lower_m.last_price
-                signals.append(Signal(
-                    market_ticker=upper_m.ticker,
-                    action=Action.SELL,
-                    side=Side.YES,
-                    price=upper_m.last_price - 1,
-                    quantity=self._quantity,
-                    confidence=min(edge / 15.0, 1.0),
-                    reason=(
-                        f"monotonicity violation: {upper_m.ticker}@{upper_m.last_price}c > "
-                        f"{lower_m.ticker}@{lower_m.last_price}c (edge={edge}c)"
-                    ),
-                    strategy_name=self.name,
-                ))
-                signals.append(Signal(
-                    market_ticker=lower_m.ticker,
-                    action=Action.BUY,
-                    side=Side.YES,
-                    price=lower_m.last_price + 1,
-                    quantity=self._quantity,
-                    confidence=min(edge / 15.0, 1.0),
-                    reason=(
-                        f"monotonicity arb counterpart: buy {lower_m.ticker}@{lower_m.last_price}c"
-                    ),
-                    strategy_name=self.name,
-                ))
+        edges = np.diff(prices)
+        confidences = np.minimum(edges / 15.0, 1.0)
+        wanted = (edges > self._min_edge) & (confidences >= self._min_confidence)
+
+        for i in np.flatnonzero(wanted).tolist():
+            lower_m, upper_m = markets[i], markets[i + 1]
+            edge = upper_m.last_price - lower_m.last_price
+            confidence = float(confidences[i])
+            signals.append(Signal(
+                market_ticker=upper_m.ticker,
+                action=Action.SELL,
+                side=Side.YES,
+                price=upper_m.last_price - 1,
+                quantity=self._quantity,
+                confidence=confidence,
+                reason=(
+                    f"monotonicity violation: {upper_m.ticker}@{upper_m.last_price}c > "
+                    f"{lower_m.ticker}@{lower_m.last_price}c (edge={edge}c)"
+                ),
+                strategy_name=self.name,
+            ))
+            signals.append(Signal(
+                market_ticker=lower_m.ticker,
+                action=Action.BUY,
+                side=Side.YES,
+                price=lower_m.last_price + 1,
+                quantity=self._quantity,
+                confidence=confidence,
+                reason=(
+                    f"monotonicity arb counterpart: buy {lower_m.ticker}@{lower_m.last_price}c"
+                ),
+                strategy_name=self.name,
+            ))
         return signals
 
-    def _check_overround(self, markets: list[Market]) -> list[Signal]:
+    def _check_overround(self, markets: list[Market], prices: np.ndarray) -> list[Signal]:
         """If mutually exclusive outcomes sum to != 100, there may be an arb."""
-        total = sum(m.last_price for m in markets if m.last_price > 0)
+        priced = prices > 0
+        total = int(prices.sum(where=priced))
         if total <= 0:
             return []
 
@@ -124,27 +182,33 @@ class CrossMarketArbStrategy(Strategy):
 
         if total > 100 + self._min_edge:
             overround = total - 100
-            most_overpriced = max(markets, key=lambda m: m.last_price)
+            confidence = min(overround / 20.0, 1.0)
+            if confidence < self._min_confidence:
+                return []
+            most_overpriced = markets[int(prices.argmax())]
             signals.append(Signal(
                 market_ticker=most_overpriced.ticker,
                 action=Action.SELL,
                 side=Side.YES,
                 price=most_overpriced.last_price - 1,
                 quantity=self._quantity,
-                confidence=min(overround / 20.0, 1.0),
+                confidence=confidence,
                 reason=f"overround={overround}c (sum={total}c), sell most expensive",
                 strategy_name=self.name,
             ))
         elif total < 100 - self._min_edge:
             underround = 100 - total
-            cheapest = min(markets, key=lambda m: m.last_price if m.last_price > 0 else 999)
+            confidence = min(underround / 20.0, 1.0)
+            if confidence < self._min_confidence:
+                return []
+            cheapest = markets[int(np.where(priced, prices, 999).argmin())]
             signals.append(Signal(
                 market_ticker=cheapest.ticker,
                 action=Action.BUY,
                 side=Side.YES,
                 price=cheapest.last_price + 1,
                 quantity=self._quantity,
-                confidence=min(underround / 20.0, 1.0),
+                confidence=confidence,
                 reason=f"underround={underround}c (sum={total}c), buy cheapest",
                 strategy_name=self.name,
             ))
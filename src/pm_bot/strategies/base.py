@@ -5,11 +5,19 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from pm_bot.api.models import Action, Market, OrderBook, Side
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
-@dataclass
+    import numpy as np
+
+    from pm_bot.data.models import MarketRow
+
+
+@dataclass(slots=True)
 class Signal:
     """A trade signal emitted by a strategy."""
 
@@ -32,6 +40,11 @@ class Strategy(ABC):
     """Base class for all trading strategies."""
 
     name: str = "base"
+    # Tickers this strategy trades; None means any ticker.
+    tickers: frozenset[str] | None = None
+    # Whether on_market_update reads past the best level on each side. When no
+    # strategy does, the backtester hands out top-of-book-only orderbooks.
+    needs_depth: bool = False
 
     @abstractmethod
     async def on_market_update(
@@ -47,5 +60,25 @@ class Strategy(ABC):
         """Return True if this strategy should consider this market."""
         ...
 
+    def watches(self, ticker: str) -> bool:
+        return self.tickers is None or ticker in self.tickers
+
+    def should_trade_record(self, record: MarketRow) -> bool:
+        """Cheap pre-check on a stored market row, before a Market is built from it.
+
+        Used by the backtester; returning False skips the row for this strategy.
+        """
+        return True
+
+    def record_mask(self, columns: Mapping[str, np.ndarray]) -> np.ndarray | None:
+        """Vectorized ``should_trade_record`` over a batch of rows.
+
+        ``columns`` maps ``MarketRow`` field names to arrays. Return a boolean array,
+        or None to have each row checked with ``should_trade_record`` instead. The
+        strategy engine also applies it to live markets, so it must only reject rows
+        ``should_trade`` would reject too.
+        """
+        return None
+
     def __repr__(self) -> str:
         return f"<Strategy: {self.name}>"
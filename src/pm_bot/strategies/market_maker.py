@@ -6,10 +6,19 @@ too much exposure.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from pm_bot.api.models import Action, Market, OrderBook, Side
 from pm_bot.strategies.base import Signal, Strategy
 from pm_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import numpy as np
+
+    from pm_bot.data.models import MarketRow
+
 log = get_logger("strategies.market_maker")
 
 
@@ -34,8 +43,18 @@ class MarketMakerStrategy(Strategy):
         self._skew_per_contract = skew_per_contract
         self._inventory: dict[str, int] = {}
 
+    def _eligible(self, volume: Any) -> Any:
+        """The market pre-check, on a scalar or on a column array."""
+        return volume >= self._min_volume
+
     def should_trade(self, market: Market) -> bool:
-        return market.volume >= self._min_volume
+        return bool(self._eligible(market.volume))
+
+    def should_trade_record(self, record: MarketRow) -> bool:
+        return bool(self._eligible(record.volume))
+
+    def record_mask(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return self._eligible(columns["volume"])
 
     def update_inventory(self, ticker: str, delta: int) -> None:
         self._inventory[ticker] = self._inventory.get(ticker, 0) + delta
@@ -45,9 +64,9 @@ class MarketMakerStrategy(Strategy):
         market: Market,
         orderbook: OrderBook,
     ) -> list[Signal]:
-        mid = orderbook.mid_price
-        spread = orderbook.spread
-        if mid is None or spread is None:
+        mid_x2 = orderbook.mid_price_x2
+        spread = orderbook.spread_ticks
+        if mid_x2 is None or spread is None:
             return []
 
         if spread < self._min_spread:
@@ -60,8 +79,8 @@ class MarketMakerStrategy(Strategy):
             return []
 
         skew = int(inventory * self._skew_per_contract)
-        bid_price = max(1, int(mid - self._half_spread - skew))
-        ask_price = min(99, int(mid + self._half_spread - skew))
+        bid_price = max(1, (mid_x2 - 2 * (self._half_spread + skew)) // 2)
+        ask_price = min(99, (mid_x2 + 2 * (self._half_spread - skew)) // 2)
 
         if bid_price >= ask_price:
             return []
@@ -75,7 +94,7 @@ class MarketMakerStrategy(Strategy):
             price=bid_price,
             quantity=self._quantity,
             confidence=0.5,
-            reason=f"MM bid at {bid_price}c (mid={mid:.1f}, inv={inventory})",
+            reason=f"MM bid at {bid_price}c (mid={mid_x2 / 2:.1f}, inv={inventory})",
             strategy_name=self.name,
         ))
 
@@ -86,7 +105,7 @@ class MarketMakerStrategy(Strategy):
             price=ask_price,
             quantity=self._quantity,
             confidence=0.5,
-            reason=f"MM ask at {ask_price}c (mid={mid:.1f}, inv={inventory})",
+            reason=f"MM ask at {ask_price}c (mid={mid_x2 / 2:.1f}, inv={inventory})",
             strategy_name=self.name,
         ))
 
@@ -7,10 +7,19 @@ a signal is generated to trade toward the estimated fair value.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from pm_bot.api.models import Action, Market, OrderBook, Side
 from pm_bot.strategies.base import Signal, Strategy
 from pm_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import numpy as np
+
+    from pm_bot.data.models import MarketRow
+
 log = get_logger("strategies.naive_value")
 
 
@@ -34,21 +43,27 @@ class NaiveValueStrategy(Strategy):
         self._max_spread = max_spread
         self._min_volume = min_volume
 
+    def _eligible(self, volume: Any, yes_bid: Any, yes_ask: Any) -> Any:
+        """The market pre-check, on scalars or on column arrays."""
+        return (volume >= self._min_volume) & (yes_bid > 0) & (yes_ask > 0)
+
     def should_trade(self, market: Market) -> bool:
-        return (
-            market.volume >= self._min_volume
-            and market.yes_bid > 0
-            and market.yes_ask > 0
-        )
+        return bool(self._eligible(market.volume, market.yes_bid, market.yes_ask))
+
+    def should_trade_record(self, record: MarketRow) -> bool:
+        return bool(self._eligible(record.volume, record.yes_bid, record.yes_ask))
+
+    def record_mask(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return self._eligible(columns["volume"], columns["yes_bid"], columns["yes_ask"])
 
     async def on_market_update(
         self,
         market: Market,
         orderbook: OrderBook,
     ) -> list[Signal]:
-        mid = orderbook.mid_price
-        spread = orderbook.spread
-        if mid is None or spread is None:
+        mid_x2 = orderbook.mid_price_x2
+        spread = orderbook.spread_ticks
+        if mid_x2 is None or spread is None:
             return []
 
         if spread < self._min_spread or spread > self._max_spread:
@@ -58,10 +73,13 @@ class NaiveValueStrategy(Strategy):
         if last <= 0:
             return []
 
-        deviation = last - mid
+        # Work in half-cents so the comparison stays in integers.
+        deviation_x2 = 2 * last - mid_x2
+        threshold_x2 = 2 * self._threshold
+        confidence = min(abs(deviation_x2) / 40.0, 1.0)
         signals: list[Signal] = []
 
-        if deviation < -self._threshold:
+        if deviation_x2 < -threshold_x2:
             bid = orderbook.best_yes_bid
             if bid is None:
                 return []
@@ -71,11 +89,11 @@ class NaiveValueStrategy(Strategy):
                 side=Side.YES,
                 price=bid + 1,
                 quantity=self._quantity,
-                confidence=min(abs(deviation) / 20.0, 1.0),
-                reason=f"underpriced by {abs(deviation):.1f}c vs mid {mid:.1f}",
+                confidence=confidence,
+                reason=f"underpriced by {abs(deviation_x2) / 2:.1f}c vs mid {mid_x2 / 2:.1f}",
                 strategy_name=self.name,
             ))
-        elif deviation > self._threshold:
+        elif deviation_x2 > threshold_x2:
             ask = orderbook.best_yes_ask
             if ask is None:
                 return []
@@ -85,8 +103,8 @@ class NaiveValueStrategy(Strategy):
                 side=Side.YES,
                 price=ask - 1,
                 quantity=self._quantity,
-                confidence=min(abs(deviation) / 20.0, 1.0),
-                reason=f"overpriced by {abs(deviation):.1f}c vs mid {mid:.1f}",
+                confidence=confidence,
+                reason=f"overpriced by {abs(deviation_x2) / 2:.1f}c vs mid {mid_x2 / 2:.1f}",
                 strategy_name=self.name,
             ))
 
@@ -9,15 +9,23 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from pm_bot.api.models import Action, Market, OrderBook, Side
 from pm_bot.strategies.base import Signal, Strategy
 from pm_bot.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import numpy as np
+
+    from pm_bot.data.models import MarketRow
+
 log = get_logger("strategies.signal")
 
 
-@dataclass
+@dataclass(slots=True)
 class ExternalEstimate:
     """An external probability estimate for a market."""
 
@@ -78,8 +86,19 @@ class SignalBasedStrategy(Strategy):
     def add_source(self, source: DataSource) -> None:
         self._sources.append(source)
 
+    @staticmethod
+    def _eligible(last_price: Any) -> Any:
+        """The market pre-check, on a scalar or on a column array."""
+        return last_price > 0
+
     def should_trade(self, market: Market) -> bool:
-        return market.last_price > 0
+        return bool(self._eligible(market.last_price))
+
+    def should_trade_record(self, record: MarketRow) -> bool:
+        return bool(self._eligible(record.last_price))
+
+    def record_mask(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return self._eligible(columns["last_price"])
 
     async def on_market_update(
         self,
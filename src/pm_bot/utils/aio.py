@@ -0,0 +1,54 @@
+"""Event loop setup shared by the bot and backtest entry points."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from pm_bot.config import get_settings
+
+T = TypeVar("T")
+
+# uvloop doesn't support Windows; winloop is its port there.
+_FAST_LOOP = "winloop" if sys.platform == "win32" else "uvloop"
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run ``main`` like ``asyncio.run``, on uvloop and with eager tasks where available.
+
+    uvloop (the ``fast`` extra; winloop on Windows) replaces the default event
+    loop and cuts per-callback overhead for socket-heavy work such as the
+    WebSocket feed. Without it the stock asyncio loop is used. The ``event_loop``
+    setting overrides this choice.
+
+    With ``asyncio.eager_task_factory`` (Python 3.12+), a task starts running as
+    soon as it is created and skips the event-loop round trip entirely if it
+    finishes without suspending. On older interpreters the default factory is kept.
+    """
+
+    async def _boot() -> T:
+        factory = getattr(asyncio, "eager_task_factory", None)
+        if factory is not None:
+            asyncio.get_running_loop().set_task_factory(factory)
+        return await main
+
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        return runner.run(_boot())
+
+
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    choice = get_settings().event_loop
+    if choice == "asyncio":
+        return None
+    if choice == "auto":
+        try:
+            return importlib.import_module(_FAST_LOOP).new_event_loop
+        except ImportError:
+            return None
+    if choice in ("uvloop", "winloop"):
+        return importlib.import_module(choice).new_event_loop
+    module, _, attr = choice.partition(":")
+    return getattr(importlib.import_module(module), attr)
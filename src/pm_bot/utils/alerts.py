@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from enum import Enum
 
@@ -11,6 +12,8 @@ from pm_bot.utils.logging import get_logger
 
 log = get_logger("utils.alerts")
 
+ALERT_TIMEOUT = httpx.Timeout(5.0)
+
 
 class AlertLevel(str, Enum):
     INFO = "info"
@@ -23,6 +26,9 @@ class AlertDispatcher(ABC):
     async def send(self, message: str, level: AlertLevel = AlertLevel.INFO) -> bool:
         ...
 
+    async def aclose(self) -> None:
+        """Release any connections held by the dispatcher."""
+
 
 class DiscordWebhookAlert(AlertDispatcher):
     """Send alerts to a Discord channel via webhook."""
@@ -35,6 +41,8 @@ class DiscordWebhookAlert(AlertDispatcher):
 
     def __init__(self, webhook_url: str) -> None:
         self._url = webhook_url
+        # Pooled across alerts, so a burst of them shares one TLS handshake.
+        self._http = httpx.AsyncClient(http2=True, timeout=ALERT_TIMEOUT)
 
     async def send(self, message: str, level: AlertLevel = AlertLevel.INFO) -> bool:
         payload = {
@@ -45,14 +53,16 @@ class DiscordWebhookAlert(AlertDispatcher):
             }]
         }
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(self._url, json=payload)
-                resp.raise_for_status()
+            resp = await self._http.post(self._url, json=payload)
+            resp.raise_for_status()
             return True
         except Exception:
             log.exception("discord_alert_failed")
             return False
 
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
 
 class TelegramBotAlert(AlertDispatcher):
     """Send alerts to a Telegram chat via Bot API."""
@@ -64,27 +74,29 @@ class TelegramBotAlert(AlertDispatcher):
     }
 
     def __init__(self, bot_token: str, chat_id: str) -> None:
-        self._bot_token = bot_token
         self._chat_id = chat_id
+        self._url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self._http = httpx.AsyncClient(http2=True, timeout=ALERT_TIMEOUT)
 
     async def send(self, message: str, level: AlertLevel = AlertLevel.INFO) -> bool:
         emoji = self.LEVEL_EMOJI.get(level, "")
         text = f"{emoji} *PM-Bot [{level.value.upper()}]*\n{message}"
-        url = f"https://api.telegram.org/bot{self._bot_token}/sendMessage"
         payload = {
             "chat_id": self._chat_id,
             "text": text,
             "parse_mode": "Markdown",
         }
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(url, json=payload)
-                resp.raise_for_status()
+            resp = await self._http.post(self._url, json=payload)
+            resp.raise_for_status()
             return True
         except Exception:
             log.exception("telegram_alert_failed")
             return False
 
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
 
 class ConsoleAlert(AlertDispatcher):
     """Print alerts to the console (always available, no config needed)."""
@@ -104,11 +116,22 @@ class AlertManager:
         self._dispatchers.append(dispatcher)
 
     async def alert(self, message: str, level: AlertLevel = AlertLevel.INFO) -> None:
+        # Dispatchers are independent, so a slow one doesn't hold up the others.
+        results = await asyncio.gather(
+            *(dispatcher.send(message, level) for dispatcher in self._dispatchers),
+            return_exceptions=True,
+        )
+        for dispatcher, result in zip(self._dispatchers, results):
+            if isinstance(result, Exception):
+                log.error(
+                    "alert_dispatch_error",
+                    dispatcher=type(dispatcher).__name__,
+                    exc_info=result,
+                )
+
+    async def aclose(self) -> None:
         for dispatcher in self._dispatchers:
-            try:
-                await dispatcher.send(message, level)
-            except Exception:
-                log.exception("alert_dispatch_error", dispatcher=type(dispatcher).__name__)
+            await dispatcher.aclose()
 
     async def info(self, message: str) -> None:
         await self.alert(message, AlertLevel.INFO)
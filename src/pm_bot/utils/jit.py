@@ -0,0 +1,30 @@
+"""Optional Numba JIT for numeric kernels.
+
+Install the ``jit`` extra to compile kernels decorated with :func:`njit`; without
+numba the decorator is a no-op and the kernels run as plain Python.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        """Stand-in for ``numba.njit`` supporting ``@njit`` and ``@njit(sig, cache=True)``."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            return fn
+
+        return decorator
+
+
+__all__ = ["HAVE_NUMBA", "njit"]
@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from datetime import date
 
 import httpx
+import orjson
 
 from pm_bot.utils.logging import get_logger
 from pm_bot.weather.parser import CityInfo
@@ -143,7 +144,7 @@ class OpenWeatherMapProvider(WeatherProvider):
             async with httpx.AsyncClient(timeout=15) as client:
                 resp = await client.get(url, params=params)
                 resp.raise_for_status()
-                data = resp.json()
+                data = orjson.loads(resp.content)
         except Exception:
             log.exception("owm_fetch_error", city=city.name)
             return None
@@ -214,7 +215,7 @@ class NOAAProvider(WeatherProvider):
         try:
             resp = await client.get(url, headers=headers)
             resp.raise_for_status()
-            forecast_url = resp.json()["properties"]["forecast"]
+            forecast_url = orjson.loads(resp.content)["properties"]["forecast"]
             self._grid_cache[grid_key] = forecast_url
             return forecast_url
         except Exception:
@@ -238,7 +239,7 @@ class NOAAProvider(WeatherProvider):
 
                 resp = await client.get(forecast_url, headers=headers)
                 resp.raise_for_status()
-                periods = resp.json()["properties"]["periods"]
+                periods = orjson.loads(resp.content)["properties"]["periods"]
         except Exception:
             log.exception("noaa_fetch_error", city=city.name)
             return None
@@ -337,7 +338,7 @@ class TomorrowIOProvider(WeatherProvider):
             async with httpx.AsyncClient(timeout=15) as client:
                 resp = await client.get(url, params=params)
                 resp.raise_for_status()
-                data = resp.json()
+                data = orjson.loads(resp.content)
         except Exception:
             log.exception("tio_fetch_error", city=city.name)
             return None